@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
+
+from src.database import (
+    create_database_if_not_exists,
+    dispose_engines,
+    get_engine,
+    new_session,
+)
+from src.models.coil_model import CoilModel
+from src.repositories.coil_statistics_repository import (
+    CoilStatisticsRepository,
+)
+
+COPY_COLUMNS = ("length", "weight", "creation_date", "deletion_date")
+
+CoilRecord = Tuple[float, float, datetime, Optional[datetime]]
+
+
+def generate_coils(
+    count: int,
+    years: float,
+    deleted_share: float,
+    mean_lifetime_days: float,
+    end: datetime,
+    rng: random.Random,
+) -> Iterator[CoilRecord]:
+    span = timedelta(days=365 * years)
+    step = span / count
+    origin = end - span
+    for index in range(count):
+        created = origin + step * index
+        length = round(rng.lognormvariate(3.0, 0.5), 2)
+        weight = round(rng.lognormvariate(6.2, 0.4), 2)
+        deleted = None
+        if rng.random() < deleted_share:
+            lifetime = timedelta(days=rng.expovariate(1 / mean_lifetime_days))
+            if created + lifetime < end:
+                deleted = (created + lifetime).replace(tzinfo=timezone.utc)
+        yield length, weight, created, deleted
+
+
+def chunked(
+    records: Iterator[CoilRecord], size: int
+) -> Iterator[List[CoilRecord]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def seed(
+    count: int,
+    years: float = 3.0,
+    deleted_share: float = 0.9,
+    mean_lifetime_days: float = 45.0,
+    chunk_size: int = 50_000,
+    rng_seed: int = 0,
+    truncate: bool = True,
+    rollup: bool = True,
+) -> dict:
+    await create_database_if_not_exists()
+    table = CoilModel.__tablename__
+    end = datetime.now(timezone.utc).replace(tzinfo=None)
+    records = generate_coils(
+        count,
+        years,
+        deleted_share,
+        mean_lifetime_days,
+        end,
+        random.Random(rng_seed),
+    )
+
+    started = perf_counter()
+    async with get_engine().connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+        assert driver is not None
+        if truncate:
+            await driver.execute(f"TRUNCATE {table} RESTART IDENTITY")
+        for chunk in chunked(records, chunk_size):
+            await driver.copy_records_to_table(
+                table, records=chunk, columns=COPY_COLUMNS
+            )
+        await driver.execute(f"ANALYZE {table}")
+    load_seconds = perf_counter() - started
+
+    rollup_days = None
+    if rollup:
+        async with new_session() as session:
+            rollup_days = await CoilStatisticsRepository().rebuild(session)
+
+    return {
+        "coils": count,
+        "years": years,
+        "deleted_share": deleted_share,
+        "mean_lifetime_days": mean_lifetime_days,
+        "load_seconds": round(load_seconds, 2),
+        "coils_per_second": round(count / load_seconds),
+        "rollup_days": rollup_days,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Seed the coils table with a synthetic dataset"
+    )
+    parser.add_argument("--coils", type=int, default=1_000_000)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--deleted-share", type=float, default=0.9)
+    parser.add_argument("--mean-lifetime-days", type=float, default=45.0)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--append", action="store_true")
+    parser.add_argument("--no-rollup", action="store_true")
+    args = parser.parse_args()
+
+    async def run() -> dict:
+        try:
+            return await seed(
+                args.coils,
+                years=args.years,
+                deleted_share=args.deleted_share,
+                mean_lifetime_days=args.mean_lifetime_days,
+                chunk_size=args.chunk_size,
+                rng_seed=args.seed,
+                truncate=not args.append,
+                rollup=not args.no_rollup,
+            )
+        finally:
+            await dispose_engines()
+
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from src.models.coil_model import CoilModel
+from src.repositories.coil_repository import CoilRepository
+from src.repositories.statement_cache import StatementCache
+from src.schemas.coil_schema import CoilFilterSchema
+
+FILTER_KEYS = tuple(CoilFilterSchema.model_fields)
+LIMIT = 51
+
+
+def make_filters(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    now = datetime.now()
+    values = {
+        "id": lambda: rng.randint(1, 100_000),
+        "length": lambda: rng.uniform(50, 500),
+        "weight": lambda: rng.uniform(100, 2000),
+        "creation_date": lambda: now - timedelta(days=rng.randint(0, 365)),
+        "deletion_date": lambda: now - timedelta(days=rng.randint(0, 365)),
+    }
+    return [
+        {
+            key: values[key.rsplit("_", 1)[0]]()
+            for key in FILTER_KEYS
+            if rng.random() < 0.3
+        }
+        for _ in range(count)
+    ]
+
+
+def compile_cached(query, dialect, compiled_cache: dict):
+    key = query._generate_cache_key().key
+    compiled = compiled_cache.get(key)
+    if compiled is None:
+        compiled = compiled_cache[key] = query.compile(dialect=dialect)
+    return compiled
+
+
+def rebuild_path(repository, filters: list, dialect) -> None:
+    for data in filters:
+        query = repository._apply_filters(select(*CoilModel.__table__.c), data)
+        query = repository._apply_keyset_pagination(query, LIMIT, None)
+        query.compile(dialect=dialect)
+
+
+def rebuild_with_sqlalchemy_cache_path(
+    repository, filters: list, dialect, compiled_cache: dict
+) -> None:
+    for data in filters:
+        query = repository._apply_filters(select(*CoilModel.__table__.c), data)
+        query = repository._apply_keyset_pagination(query, LIMIT, None)
+        compile_cached(query, dialect, compiled_cache)
+
+
+def statement_cache_path(
+    repository, filters: list, dialect, compiled_cache: dict, cache
+) -> None:
+    for data in filters:
+        params = repository._filter_params(data)
+        query = cache.get(
+            ("filtered", frozenset(params), False, True),
+            lambda: repository._filtered_query(params, False, True),
+        )
+        compile_cached(query, dialect, compiled_cache)
+        params["limit"] = LIMIT
+
+
+def measure(path, *args, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        path(*args)
+        best = min(best, perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Python-side cost of building /coils/filtered queries"
+    )
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    repository = CoilRepository()
+    dialect = asyncpg_dialect(paramstyle="numeric_dollar")
+    filters = make_filters(args.requests, args.seed)
+    cache = StatementCache()
+
+    paths: Dict[str, Tuple[Any, ...]] = {
+        "rebuild_and_compile": (rebuild_path, repository, filters, dialect),
+        "rebuild_with_compiled_cache": (
+            rebuild_with_sqlalchemy_cache_path,
+            repository,
+            filters,
+            dialect,
+            {},
+        ),
+        "statement_cache": (
+            statement_cache_path,
+            repository,
+            filters,
+            dialect,
+            {},
+            cache,
+        ),
+    }
+    results = {}
+    for name, (path, *path_args) in paths.items():
+        seconds = measure(path, *path_args, repeat=args.repeat)
+        results[name] = {
+            "total_ms": round(seconds * 1000, 2),
+            "per_request_us": round(seconds / args.requests * 1_000_000, 2),
+        }
+    results["speedup"] = round(
+        results["rebuild_and_compile"]["total_ms"]
+        / results["statement_cache"]["total_ms"],
+        2,
+    )
+    print(
+        json.dumps(
+            {
+                "requests": args.requests,
+                "shapes": cache.snapshot()["size"],
+                **results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
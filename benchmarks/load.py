@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from statistics import mean
+from time import perf_counter
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, func, select
+
+from src.database import dispose_engines, get_engine, new_session
+from src.main import app
+from src.models.coil_model import CoilModel
+
+RequestSpec = Tuple[str, str, dict]
+
+
+@dataclass
+class Context:
+    rng: random.Random
+    max_id: int
+    oldest: datetime
+    newest: datetime
+    active_ids: List[int]
+    created_ids: List[int]
+
+    def moment(self) -> datetime:
+        span = (self.newest - self.oldest).total_seconds()
+        return self.oldest + timedelta(seconds=self.rng.random() * span)
+
+
+def create_coil(context: Context) -> RequestSpec:
+    body = {
+        "length": round(context.rng.uniform(5, 80), 2),
+        "weight": round(context.rng.uniform(200, 1500), 2),
+    }
+    return "POST", "/api/coils/", {"json": body}
+
+
+def delete_coil(context: Context) -> RequestSpec:
+    if context.created_ids:
+        coil_id = context.created_ids.pop()
+    elif context.active_ids:
+        coil_id = context.active_ids.pop()
+    else:
+        coil_id = context.rng.randint(1, context.max_id)
+    return "DELETE", f"/api/coils/{coil_id}", {}
+
+
+def filtered(params: Callable[[Context], dict]):
+    def build(context: Context) -> RequestSpec:
+        return "GET", "/api/coils/filtered", {"params": params(context)}
+
+    return build
+
+
+def id_range(context: Context) -> dict:
+    start = context.rng.randint(1, max(context.max_id - 1000, 1))
+    return {"id_min": start, "id_max": start + 1000}
+
+
+def dimensions(context: Context) -> dict:
+    length = context.rng.uniform(5, 60)
+    weight = context.rng.uniform(200, 1200)
+    return {
+        "length_min": length,
+        "length_max": length + 5,
+        "weight_min": weight,
+        "weight_max": weight + 100,
+    }
+
+
+def creation_window(context: Context) -> dict:
+    start = context.moment()
+    return {
+        "creation_date_min": start.isoformat(),
+        "creation_date_max": (start + timedelta(days=1)).isoformat(),
+    }
+
+
+def deletion_window(context: Context) -> dict:
+    start = context.moment()
+    return {
+        "deletion_date_min": start.isoformat(),
+        "deletion_date_max": (start + timedelta(days=1)).isoformat(),
+    }
+
+
+def mixed(context: Context) -> dict:
+    return {**creation_window(context), **dimensions(context)}
+
+
+def statistics(days: int, backend: str):
+    def build(context: Context) -> RequestSpec:
+        end = context.newest - timedelta(
+            days=context.rng.uniform(0, max(days, 30))
+        )
+        params = {
+            "start_date": (end - timedelta(days=days)).isoformat(),
+            "end_date": end.isoformat(),
+            "backend": backend,
+        }
+        return "GET", "/api/statistics/", {"params": params}
+
+    return build
+
+
+SCENARIOS: Dict[str, Callable[[Context], RequestSpec]] = {
+    "create": create_coil,
+    "delete": delete_coil,
+    "filtered_id_range": filtered(id_range),
+    "filtered_dimensions": filtered(dimensions),
+    "filtered_creation_window": filtered(creation_window),
+    "filtered_deletion_window": filtered(deletion_window),
+    "filtered_mixed": filtered(mixed),
+    "statistics_7d": statistics(7, "sql"),
+    "statistics_30d": statistics(30, "sql"),
+    "statistics_365d": statistics(365, "sql"),
+    "statistics_365d_sweep": statistics(365, "sweep"),
+    "statistics_365d_rollup": statistics(365, "rollup"),
+}
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args) -> None:
+        self.count += 1
+
+    def attach(self) -> None:
+        event.listen(get_engine().sync_engine, "before_cursor_execute", self)
+
+    def detach(self) -> None:
+        event.remove(get_engine().sync_engine, "before_cursor_execute", self)
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(share * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def load_context(rng: random.Random, active: int) -> Context:
+    async with new_session() as session:
+        result = await session.execute(
+            select(
+                func.coalesce(func.max(CoilModel.id), 1),
+                func.min(CoilModel.creation_date),
+                func.max(CoilModel.creation_date),
+            )
+        )
+        max_id, oldest, newest = result.one()
+        result = await session.execute(
+            select(CoilModel.id)
+            .where(CoilModel.deletion_date.is_(None))
+            .order_by(CoilModel.id)
+            .limit(active)
+        )
+        active_ids = list(result.scalars())
+    now = datetime.now()
+    return Context(
+        rng=rng,
+        max_id=max_id,
+        oldest=oldest or now - timedelta(days=365),
+        newest=newest or now,
+        active_ids=active_ids,
+        created_ids=[],
+    )
+
+
+async def run_scenario(
+    client: AsyncClient,
+    context: Context,
+    build: Callable[[Context], RequestSpec],
+    requests: int,
+    concurrency: int,
+    counter: Optional[StatementCounter],
+) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    specs = [build(context) for _ in range(requests)]
+    queue: asyncio.Queue = asyncio.Queue()
+    for spec in specs:
+        queue.put_nowait(spec)
+
+    async def worker() -> None:
+        while not queue.empty():
+            method, url, options = queue.get_nowait()
+            started = perf_counter()
+            response = await client.request(method, url, **options)
+            latencies.append((perf_counter() - started) * 1000)
+            status = str(response.status_code)
+            statuses[status] = statuses.get(status, 0) + 1
+            if method == "POST" and response.status_code == 201:
+                context.created_ids.append(response.json()["id"])
+
+    statements_before = counter.count if counter else 0
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - started
+
+    result = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            "mean": round(mean(latencies), 3),
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(max(latencies), 3),
+        },
+        "sql_statements": None,
+    }
+    if counter:
+        statements = counter.count - statements_before
+        result["sql_statements"] = {
+            "total": statements,
+            "per_request": round(statements / requests, 2),
+        }
+    return result
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str]) -> AsyncIterator[AsyncClient]:
+    if base_url:
+        async with AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://bench", timeout=60
+    ) as client:
+        yield client
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    names = args.scenarios or list(SCENARIOS)
+    unknown = sorted(set(names) - set(SCENARIOS))
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    context = await load_context(random.Random(args.seed), args.requests)
+    counter = None if args.base_url else StatementCounter()
+    results = {}
+    if counter:
+        counter.attach()
+    try:
+        async with open_client(args.base_url) as client:
+            for name in names:
+                results[name] = await run_scenario(
+                    client,
+                    context,
+                    SCENARIOS[name],
+                    args.requests,
+                    args.concurrency,
+                    counter,
+                )
+    finally:
+        if counter:
+            counter.detach()
+        await dispose_engines()
+
+    return {
+        "revision": git_revision(),
+        "target": args.base_url or "in-process",
+        "seed": args.seed,
+        "coils": context.max_id,
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run load scenarios against the coils API"
+    )
+    parser.add_argument(
+        "scenarios", nargs="*", help=f"One of: {', '.join(SCENARIOS)}"
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--base-url",
+        help="Benchmark a running server instead of the in-process app",
+    )
+    parser.add_argument("--output", help="Write the JSON report to a file")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import cast
+
+from sqlalchemy.engine.result import result_tuple
+
+from src.models.coil_model import CoilModel
+from src.schemas.coil_schema import (
+    CoilPage,
+    CoilPageSchema,
+    CoilRow,
+    CoilSchema,
+    coil_page_adapter,
+)
+
+COLUMNS = ("id", "length", "weight", "creation_date", "deletion_date")
+
+
+def make_records(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        (
+            index,
+            100.0 + index % 50,
+            500.0 + index % 70,
+            now - timedelta(minutes=index),
+            now if index % 3 == 0 else None,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def orm_path(records: list) -> bytes:
+    coils = [CoilModel(**dict(zip(COLUMNS, record))) for record in records]
+    page = CoilPageSchema(
+        items=[
+            CoilSchema.model_validate(coil, from_attributes=True)
+            for coil in coils
+        ],
+        next_cursor=None,
+    )
+    validated = CoilPageSchema.model_validate(page.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode()
+
+
+def row_path(records: list) -> bytes:
+    make_row = result_tuple(COLUMNS)
+    rows = [make_row(record) for record in records]
+    page: CoilPage = {
+        "items": [cast(CoilRow, row._asdict()) for row in rows],
+        "next_cursor": None,
+    }
+    return coil_page_adapter.dump_json(page)
+
+
+def measure(path, records: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        path(records)
+        best = min(best, perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-row cost of serializing coil list responses"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = make_records(args.rows)
+    assert json.loads(orm_path(records[:10])) == json.loads(
+        row_path(records[:10])
+    )
+
+    results = {}
+    for name, path in (("orm", orm_path), ("plain_rows", row_path)):
+        seconds = measure(path, records, args.repeat)
+        results[name] = {
+            "total_ms": round(seconds * 1000, 2),
+            "per_row_us": round(seconds / args.rows * 1_000_000, 3),
+        }
+    results["speedup"] = round(
+        results["orm"]["total_ms"] / results["plain_rows"]["total_ms"], 2
+    )
+    print(json.dumps({"row_count": args.rows, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Request
+
+from src.database import reads_from_primary
+from src.schemas.batch_schema import BatchRequest, BatchResponse
+from src.services.batch_service import BatchService
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+service = BatchService()
+
+
+@router.post("/", response_model=BatchResponse)
+async def run_batch(request: Request, data: BatchRequest):
+    return await service.run(data, reads_from_primary(request))
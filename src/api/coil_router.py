@@ -1,32 +1,136 @@
-from typing import List
+from datetime import datetime
+from typing import Annotated, List, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Query
+from fastapi.responses import Response, StreamingResponse
 
 from src.services.coil_service import CoilService
-from src.schemas.coil_schema import CoilAddSchema, CoilSchema, CoilFilterSchema
-from src.database import SessionDep
+from src.schemas.coil_schema import (
+    CoilAddSchema,
+    CoilAsOfSummarySchema,
+    CoilCountSchema,
+    CoilBulkDeleteResponse,
+    CoilBulkDeleteSchema,
+    CoilExportFormat,
+    CoilFilterSchema,
+    CoilPageSchema,
+    CoilSchema,
+    coil_page_adapter,
+)
+from src.schemas.pagination_schema import PaginationSchema
+from src.config import settings
+from src.database import ReadSessionDep, SessionDep
 
 router = APIRouter(prefix="/coils", tags=["coils"])
 service = CoilService()
 
+EXPORT_MEDIA_TYPES = {
+    CoilExportFormat.NDJSON: "application/x-ndjson",
+    CoilExportFormat.CSV: "text/csv",
+}
+
 
 @router.post("/", response_model=CoilSchema, status_code=201)
 async def add_coil(data: CoilAddSchema, session: SessionDep):
     return await service.create(session, data)
 
 
+@router.post("/bulk", response_model=List[CoilSchema], status_code=201)
+async def add_coils(
+    data: Annotated[
+        List[CoilAddSchema],
+        Body(min_length=1, max_length=settings.bulk_max_items),
+    ],
+    session: SessionDep,
+):
+    return await service.create_many(session, data)
+
+
+@router.post("/bulk/delete", response_model=CoilBulkDeleteResponse)
+async def delete_coils(data: CoilBulkDeleteSchema, session: SessionDep):
+    return await service.delete_many(session, data)
+
+
 @router.delete("/{id}", response_model=CoilSchema)
 async def delete_coil(id: int, session: SessionDep):
     return await service.delete(session, id)
 
 
-@router.get("/filtered", response_model=List[CoilSchema])
+@router.get("/filtered", response_model=CoilPageSchema)
 async def get_filtered_coils(
-    session: SessionDep, filter_params: CoilFilterSchema = Depends()
+    session: ReadSessionDep,
+    filter_params: CoilFilterSchema = Depends(),
+    pagination: PaginationSchema = Depends(),
+):
+    page = await service.get_filtered(session, filter_params, pagination)
+    return Response(
+        coil_page_adapter.dump_json(page), media_type="application/json"
+    )
+
+
+@router.get("/count", response_model=CoilCountSchema)
+async def count_coils(
+    session: ReadSessionDep,
+    filter_params: CoilFilterSchema = Depends(),
+    approximate: bool = Query(
+        default=False,
+        description=(
+            "Estimate the unfiltered count from planner statistics "
+            "(default: false)"
+        ),
+    ),
 ):
-    return await service.get_filtered(session, filter_params)
+    return await service.count(session, filter_params, approximate)
 
 
-@router.get("/", response_model=List[CoilSchema])
-async def get_coils(session: SessionDep):
-    return await service.get_all(session)
+@router.get(
+    "/as-of", response_model=Union[CoilPageSchema, CoilAsOfSummarySchema]
+)
+async def get_coils_as_of(
+    session: ReadSessionDep,
+    ts: datetime = Query(
+        ..., description=("Moment to reconstruct the inventory at")
+    ),
+    summary: bool = Query(
+        default=False,
+        description=("Return only count and totals (default: false)"),
+    ),
+    pagination: PaginationSchema = Depends(),
+):
+    if summary:
+        return await service.get_as_of_summary(session, ts)
+
+    page = await service.get_as_of(session, ts, pagination)
+    return Response(
+        coil_page_adapter.dump_json(page), media_type="application/json"
+    )
+
+
+@router.get("/export")
+async def export_coils(
+    filter_params: CoilFilterSchema = Depends(),
+    export_format: CoilExportFormat = Query(
+        default=CoilExportFormat.NDJSON,
+        alias="format",
+        description=("Export format (default: ndjson)"),
+    ),
+):
+    return StreamingResponse(
+        service.export(filter_params, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=coils.{export_format.value}"
+            )
+        },
+    )
+
+
+@router.get("/", response_model=CoilPageSchema)
+async def get_coils(
+    session: ReadSessionDep, pagination: PaginationSchema = Depends()
+):
+    page = await service.get_all(session, pagination)
+    return Response(
+        coil_page_adapter.dump_json(page), media_type="application/json"
+    )
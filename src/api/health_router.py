@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from src.schemas.health_schema import HealthResponse
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live", response_model=HealthResponse)
+async def get_liveness():
+    return {"status": "alive"}
+
+
+@router.get("/ready", response_model=HealthResponse)
+async def get_readiness(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(
+            status_code=503, detail="Database warm-up is not finished"
+        )
+    return {"status": "ready"}
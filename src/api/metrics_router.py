@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+
+from src.database import pool_metrics
+from src.instrumentation import sql_metrics
+from src.repositories.statement_cache import statement_cache
+from src.schemas.metrics_schema import (
+    PoolMetricsResponse,
+    SqlMetricsResponse,
+    StatementCacheMetricsResponse,
+    StatisticsCacheMetricsResponse,
+)
+from src.services.statistics_cache import statistics_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/pool", response_model=PoolMetricsResponse)
+async def get_pool_metrics():
+    return pool_metrics.snapshot()
+
+
+@router.get("/statistics-cache", response_model=StatisticsCacheMetricsResponse)
+async def get_statistics_cache_metrics():
+    return statistics_cache.snapshot()
+
+
+@router.get("/sql", response_model=SqlMetricsResponse)
+async def get_sql_metrics():
+    return sql_metrics.snapshot()
+
+
+@router.get("/statement-cache", response_model=StatementCacheMetricsResponse)
+async def get_statement_cache_metrics():
+    return statement_cache.snapshot()
@@ -1,13 +1,20 @@
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
 
 from src.services.statistics_service import StatisticsService
 from src.schemas.statistics_schema import (
+    OccupancySeriesResponse,
+    StatisticsBackend,
+    StatisticsDistributionResponse,
+    StatisticsGranularity,
+    StatisticsJobCreateSchema,
+    StatisticsJobSchema,
     StatisticsPeriodSchema,
     StatisticsResponse,
 )
-from src.database import SessionDep
+from src.database import ReadSessionDep, reads_from_primary
 
 router = APIRouter(prefix="/statistics", tags=["statistics"])
 service = StatisticsService()
@@ -15,7 +22,8 @@ service = StatisticsService()
 
 @router.get("/", response_model=StatisticsResponse)
 async def get_statistics(
-    session: SessionDep,
+    request: Request,
+    session: ReadSessionDep,
     start_date: datetime = Query(
         default_factory=lambda: (datetime.now() - timedelta(days=30)),
         description=("Start date in timestamp format (default: 30 days ago)"),
@@ -24,8 +32,80 @@ async def get_statistics(
         default_factory=lambda: datetime.now(),
         description=("End date in timestamp format (default: current date)"),
     ),
+    backend: StatisticsBackend = Query(
+        default=StatisticsBackend.SQL,
+        description=("Daily occupancy engine (default: sql)"),
+    ),
+):
+    filter_params = StatisticsPeriodSchema(
+        start_date=start_date, end_date=end_date
+    )
+    return await service.get_statistics(
+        session, filter_params, backend, reads_from_primary(request)
+    )
+
+
+@router.get("/distribution", response_model=StatisticsDistributionResponse)
+async def get_distribution(
+    session: ReadSessionDep,
+    start_date: datetime = Query(
+        default_factory=lambda: (datetime.now() - timedelta(days=30)),
+        description=("Start date in timestamp format (default: 30 days ago)"),
+    ),
+    end_date: datetime = Query(
+        default_factory=lambda: datetime.now(),
+        description=("End date in timestamp format (default: current date)"),
+    ),
+    buckets: int = Query(
+        default=10,
+        gt=0,
+        le=100,
+        description=("Histogram buckets per metric (default: 10)"),
+    ),
+    approximate: bool = Query(
+        default=False,
+        description=("Estimate from a table sample (default: false)"),
+    ),
+):
+    filter_params = StatisticsPeriodSchema(
+        start_date=start_date, end_date=end_date
+    )
+    return await service.get_distribution(
+        session, filter_params, buckets, approximate
+    )
+
+
+@router.get("/timeseries", response_model=OccupancySeriesResponse)
+async def get_occupancy_series(
+    start_date: datetime = Query(
+        default_factory=lambda: (datetime.now() - timedelta(days=30)),
+        description=("Start date in timestamp format (default: 30 days ago)"),
+    ),
+    end_date: datetime = Query(
+        default_factory=lambda: datetime.now(),
+        description=("End date in timestamp format (default: current date)"),
+    ),
+    granularity: StatisticsGranularity = Query(
+        default=StatisticsGranularity.DAY,
+        description=("Bucket size (default: day)"),
+    ),
 ):
     filter_params = StatisticsPeriodSchema(
         start_date=start_date, end_date=end_date
     )
-    return await service.get_statistics(session, filter_params)
+    return StreamingResponse(
+        service.get_occupancy_series(filter_params, granularity),
+        media_type="application/json",
+    )
+
+
+@router.post("/jobs", response_model=StatisticsJobSchema, status_code=202)
+async def create_statistics_job(
+    request: Request, data: StatisticsJobCreateSchema
+):
+    return await service.create_job(data, reads_from_primary(request))
+
+
+@router.get("/jobs/{job_id}", response_model=StatisticsJobSchema)
+async def get_statistics_job(job_id: str):
+    return await service.get_job(job_id)
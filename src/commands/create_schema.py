@@ -0,0 +1,13 @@
+import asyncio
+
+from src.database import create_database_if_not_exists, dispose_engines
+
+
+async def create_schema() -> None:
+    await create_database_if_not_exists()
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(create_schema())
+    print("Database schema is up to date")
@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+from datetime import timedelta
+from typing import Dict, List
+
+from src.config import settings
+from src.database import (
+    create_database_if_not_exists,
+    dispose_engines,
+    get_engine,
+)
+from src.models.coil_model import CoilModel
+from src.partitions import (
+    archive_partitions,
+    ensure_partitions,
+    is_partitioned,
+)
+
+
+async def maintain_partitions(
+    archive: bool = False, drop: bool = False
+) -> Dict[str, List[str]]:
+    if not settings.coils_partition_interval:
+        raise SystemExit("COILS_PARTITION_INTERVAL is not set")
+
+    await create_database_if_not_exists()
+    table = CoilModel.__tablename__
+    async with get_engine().begin() as connection:
+        if not await connection.run_sync(is_partitioned, table):
+            raise SystemExit(f"Table {table} is not partitioned")
+
+        created = await connection.run_sync(ensure_partitions, table)
+        archived = []
+        if archive:
+            archived = await connection.run_sync(
+                archive_partitions,
+                table,
+                timedelta(days=settings.coils_archive_after_days),
+                drop,
+            )
+    await dispose_engines()
+    return {"created": created, "archived": archived}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Create upcoming coil partitions and archive old ones"
+    )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Detach partitions whose coils were all deleted long ago",
+    )
+    parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="Drop archived partitions instead of keeping them as tables",
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(maintain_partitions(args.archive, args.drop))
+    print(f"Created partitions: {', '.join(result['created']) or '-'}")
+    print(f"Archived partitions: {', '.join(result['archived']) or '-'}")
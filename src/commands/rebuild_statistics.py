@@ -0,0 +1,17 @@
+import asyncio
+
+from src.database import create_database_if_not_exists, new_session
+from src.repositories.coil_statistics_repository import (
+    CoilStatisticsRepository,
+)
+
+
+async def rebuild_statistics() -> int:
+    await create_database_if_not_exists()
+    async with new_session() as session:
+        return await CoilStatisticsRepository().rebuild(session)
+
+
+if __name__ == "__main__":
+    days = asyncio.run(rebuild_statistics())
+    print(f"Rebuilt daily statistics for {days} days")
@@ -0,0 +1,56 @@
+from typing import List, Literal, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    postgres_user: str
+    postgres_host: str
+    postgres_port: int
+    postgres_db: str
+
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_pool_warmup: bool = True
+    db_warmup_retry_interval: float = 5
+    db_create_schema: bool = False
+    db_statement_cache_size: int = 100
+    db_slow_query_threshold: float = 0.5
+    db_read_urls: List[str] = []
+    db_read_your_writes_seconds: float = 5
+
+    coils_partition_interval: Optional[Literal["month", "quarter"]] = None
+    coils_partitions_ahead: int = 3
+    coils_archive_after_days: int = 365
+
+    export_batch_size: int = 1000
+    bulk_max_items: int = 10000
+    bulk_copy_threshold: int = 1000
+    batch_concurrency: int = 5
+
+    statistics_cache_size: int = 256
+    statistics_cache_ttl: float = 300
+    statistics_cache_resolution: float = 60
+    statistics_sample_percent: float = 10
+    statistics_jobs_concurrency: int = 2
+    statistics_jobs_retention: float = 3600
+    statistics_jobs_chunks: int = 1200
+
+    @property
+    def database_url(self) -> str:
+        return (
+            f"postgresql+asyncpg://"
+            f"{self.postgres_user}@"
+            f"{self.postgres_host}:"
+            f"{self.postgres_port}/"
+            f"{self.postgres_db}"
+        )
+
+
+settings = Settings()
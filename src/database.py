@@ -1,44 +1,273 @@
-import os
-from typing import Annotated, AsyncGenerator
+import asyncio
+from contextlib import AsyncExitStack
+from itertools import cycle
+from math import ceil
+from time import perf_counter, time
+from typing import (
+    Annotated,
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    cast,
+)
 
-from dotenv import load_dotenv
-from fastapi import Depends
+from fastapi import Depends, Request, Response
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import QueuePool
 
+from src.config import settings
+from src.instrumentation import instrument_engine
+
+PRIMARY_READS_COOKIE = "db_primary_until"
+
+
+def build_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        future=True,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        },
+    )
+    instrument_engine(engine)
+    return engine
 
-load_dotenv()
-DATABASE_URL = (
-    f"postgresql+asyncpg://"
-    f"{os.environ['POSTGRES_USER']}@"
-    f"{os.environ['POSTGRES_HOST']}:"
-    f"{os.environ['POSTGRES_PORT']}/"
-    f"{os.environ['POSTGRES_DB']}"
-)
 
-engine = create_async_engine(
-    DATABASE_URL,
-    future=True,
-    echo=True,
-    poolclass=NullPool,
-)
-new_session = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
+_engine: Optional[AsyncEngine] = None
+_sessions: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_engine() -> AsyncEngine:
+    global _engine, _sessions
+    if _engine is None:
+        _engine = build_engine(settings.database_url)
+        _sessions = async_sessionmaker(_engine, expire_on_commit=False)
+    return _engine
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    get_engine()
+    assert _sessions is not None
+    return _sessions
+
+
+def new_session() -> AsyncSession:
+    return get_sessionmaker()()
+
+
+class ReadRouter:
+    def __init__(self, urls: List[str]):
+        self.replicas = [build_engine(url) for url in urls]
+        self.engines = self.replicas or [get_engine()]
+        self._sessions = cycle(
+            async_sessionmaker(read_engine, expire_on_commit=False)
+            for read_engine in self.engines
+        )
+
+    def new_session(self) -> AsyncSession:
+        return next(self._sessions)()
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+_read_router: Optional[ReadRouter] = None
+
+
+def get_read_router() -> ReadRouter:
+    global _read_router
+    if _read_router is None:
+        _read_router = ReadRouter(settings.db_read_urls)
+    return _read_router
+
+
+def new_read_session() -> AsyncSession:
+    return get_read_router().new_session()
+
+
+async def dispose_engines() -> None:
+    if _read_router is not None:
+        await _read_router.dispose()
+    if _engine is not None:
+        await _engine.dispose()
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.acquisitions = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.acquisitions += 1
+        self.wait_time_total += seconds
+        self.wait_time_max = max(self.wait_time_max, seconds)
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self._pool_snapshot(get_engine()),
+            "max_overflow": settings.db_max_overflow,
+            "acquisitions": self.acquisitions,
+            "wait_time_total": self.wait_time_total,
+            "wait_time_avg": (
+                self.wait_time_total / self.acquisitions
+                if self.acquisitions
+                else 0.0
+            ),
+            "wait_time_max": self.wait_time_max,
+            "engines": {
+                pool_engine.url.render_as_string(): self._pool_snapshot(
+                    pool_engine
+                )
+                for pool_engine in [get_engine(), *get_read_router().replicas]
+            },
+        }
+
+    def _pool_snapshot(self, pool_engine: AsyncEngine) -> Dict[str, int]:
+        pool = cast(QueuePool, pool_engine.pool)
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+async def get_session(
+    response: Response,
+) -> AsyncGenerator[AsyncSession, None]:
     async with new_session() as session:
+        if (
+            get_read_router().replicas
+            and settings.db_read_your_writes_seconds > 0
+        ):
+            event.listen(
+                session.sync_session,
+                "after_commit",
+                lambda _: stick_to_primary(response),
+            )
+
+        await acquire_connection(session)
         yield session
 
 
+def stick_to_primary(response: Response) -> None:
+    sticky_seconds = settings.db_read_your_writes_seconds
+    response.set_cookie(
+        PRIMARY_READS_COOKIE,
+        str(time() + sticky_seconds),
+        max_age=ceil(sticky_seconds),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+async def get_read_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    if reads_from_primary(request):
+        session = new_session()
+    else:
+        session = new_read_session()
+
+    async with session:
+        await acquire_connection(session)
+        yield session
+
+
+async def acquire_connection(session: AsyncSession) -> None:
+    started = perf_counter()
+    await session.connection()
+    pool_metrics.observe_wait(perf_counter() - started)
+
+
+def reads_from_primary(request: Request) -> bool:
+    primary_until = request.cookies.get(PRIMARY_READS_COOKIE)
+    if not primary_until:
+        return False
+    try:
+        return float(primary_until) > time()
+    except ValueError:
+        return False
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    return session.bind in get_read_router().replicas
+
+
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
 
 
 async def create_database_if_not_exists():
-    async with engine.begin() as connection:
+    async with get_engine().begin() as connection:
         await connection.run_sync(Base.metadata.create_all)
+
+
+async def check_connection() -> None:
+    async with get_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def warm_up_pool(
+    prepare: Optional[Callable[[AsyncSession], Awaitable[None]]] = None,
+) -> None:
+    if not settings.db_pool_warmup:
+        await check_connection()
+        return
+
+    async def gather_all(*aws: Awaitable[Any]) -> List[Any]:
+        results = await asyncio.gather(*aws, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def warm_up_connection(connection: AsyncConnection):
+        await connection.execute(text("SELECT 1"))
+        if prepare is not None:
+            async with AsyncSession(bind=connection) as session:
+                await prepare(session)
+
+    async def warm_up_engine(pool_engine: AsyncEngine):
+        async with AsyncExitStack() as stack:
+            connections = await gather_all(
+                *(
+                    stack.enter_async_context(pool_engine.connect())
+                    for _ in range(settings.db_pool_size)
+                )
+            )
+            await gather_all(
+                *(warm_up_connection(connection) for connection in connections)
+            )
+
+    await gather_all(
+        *(
+            warm_up_engine(pool_engine)
+            for pool_engine in [get_engine(), *get_read_router().replicas]
+        )
+    )
@@ -0,0 +1,201 @@
+import logging
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_BUCKETS = (1, 2, 5, 10, 25, 50, 100)
+DB_TIME_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+ROW_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+SLOWEST_STATEMENT_LENGTH = 500
+
+
+class RequestStats:
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def observe(self, statement: str, seconds: float, rows: int) -> None:
+        self.statements += 1
+        self.db_time += seconds
+        self.rows += max(rows, 0)
+        if seconds >= self.slowest_time:
+            self.slowest_time = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self, total: float) -> str:
+        return ", ".join(
+            (
+                f"db;dur={self.db_time * 1000:.3f}"
+                f';desc="{self.statements} statements"',
+                f"db-slowest;dur={self.slowest_time * 1000:.3f}",
+                f'db-rows;desc="{self.rows}"',
+                f"app;dur={total * 1000:.3f}",
+            )
+        )
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+class Histogram:
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [str(bound) for bound in self.bounds] + ["+Inf"]
+        cumulative = 0
+        buckets = {}
+        for label, count in zip(labels, self.counts):
+            cumulative += count
+            buckets[label] = cumulative
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_time_ms = Histogram(DB_TIME_BUCKETS)
+        self.rows = Histogram(ROW_BUCKETS)
+        self.slowest_time_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def observe(self, stats: RequestStats) -> None:
+        self.statements.observe(stats.statements)
+        self.db_time_ms.observe(stats.db_time * 1000)
+        self.rows.observe(stats.rows)
+        if stats.slowest_time * 1000 > self.slowest_time_ms:
+            self.slowest_time_ms = stats.slowest_time * 1000
+            self.slowest_statement = stats.slowest_statement
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.statements.count,
+            "statements": self.statements.snapshot(),
+            "db_time_ms": self.db_time_ms.snapshot(),
+            "rows": self.rows.snapshot(),
+            "slowest_time_ms": self.slowest_time_ms,
+            "slowest_statement": self.slowest_statement,
+        }
+
+
+class SqlMetrics:
+    def __init__(self):
+        self.routes: Dict[str, RouteMetrics] = {}
+        self.slow_statements = 0
+
+    def observe(self, route: str, stats: RequestStats) -> None:
+        metrics = self.routes.get(route)
+        if metrics is None:
+            metrics = self.routes[route] = RouteMetrics()
+        metrics.observe(stats)
+
+    def clear(self) -> None:
+        self.routes.clear()
+        self.slow_statements = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "slow_query_threshold": settings.db_slow_query_threshold,
+            "slow_statements": self.slow_statements,
+            "routes": {
+                route: metrics.snapshot()
+                for route, metrics in sorted(self.routes.items())
+            },
+        }
+
+
+sql_metrics = SqlMetrics()
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    context._query_started = perf_counter()
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    seconds = perf_counter() - context._query_started
+    statement = statement[:SLOWEST_STATEMENT_LENGTH]
+
+    stats = request_stats.get()
+    if stats is not None:
+        stats.observe(statement, seconds, cursor.rowcount)
+
+    threshold = settings.db_slow_query_threshold
+    if threshold > 0 and seconds >= threshold:
+        sql_metrics.slow_statements += 1
+        logger.warning("Slow query (%.1f ms): %s", seconds * 1000, statement)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if event.contains(
+        sync_engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SqlTimingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        started = perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    stats.server_timing(perf_counter() - started),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_stats.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                sql_metrics.observe(f"{scope['method']} {route.path}", stats)
@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+
+from src.config import settings
+from src.database import (
+    create_database_if_not_exists,
+    dispose_engines,
+    warm_up_pool,
+)
+from src.repositories.coil_repository import CoilRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(app: FastAPI) -> None:
+    repository = CoilRepository()
+    while True:
+        try:
+            await warm_up_pool(repository.prepare_statements)
+        except Exception as error:
+            logger.warning(
+                "Database warm-up failed, retrying in %.1f s: %s",
+                settings.db_warmup_retry_interval,
+                error,
+            )
+            await asyncio.sleep(settings.db_warmup_retry_interval)
+            continue
+
+        app.state.ready = True
+        return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.ready = False
+    if settings.db_create_schema:
+        await create_database_if_not_exists()
+
+    warm_up_task = asyncio.create_task(warm_up(app))
+    try:
+        yield
+    finally:
+        warm_up_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warm_up_task
+        app.state.ready = False
+        await dispose_engines()
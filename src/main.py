@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 
 from src.api.routers import main_router
+from src.instrumentation import SqlTimingMiddleware
+from src.lifespan import lifespan
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(SqlTimingMiddleware)
 app.include_router(main_router)
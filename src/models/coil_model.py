@@ -1,15 +1,36 @@
 from datetime import datetime
 
-from sqlalchemy import text, CheckConstraint, DateTime
+from sqlalchemy import (
+    event,
+    func,
+    literal_column,
+    text,
+    CheckConstraint,
+    DateTime,
+    Index,
+)
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.expression import ColumnElement
 
 from src.database import Base
+from src.partitions import configure_partitioning, create_initial_partitions
 
 
 class CoilModel(Base):
     __tablename__ = "coils"
+    __table_args__ = (
+        Index("ix_coils_length", "length"),
+        Index("ix_coils_weight", "weight"),
+        Index("ix_coils_creation_date", "creation_date"),
+        Index("ix_coils_deletion_date", "deletion_date"),
+        Index(
+            "ix_coils_active_creation_date",
+            "creation_date",
+            postgresql_where=text("deletion_date IS NULL"),
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     length: Mapped[float] = mapped_column(CheckConstraint("length > 0"))
     weight: Mapped[float] = mapped_column(CheckConstraint("weight > 0"))
     creation_date: Mapped[datetime] = mapped_column(
@@ -18,3 +39,19 @@ class CoilModel(Base):
     deletion_date: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True)
     )
+
+    __mapper_args__ = {"primary_key": [id]}
+
+
+def stored_period() -> ColumnElement:
+    return func.tsrange(
+        CoilModel.creation_date,
+        func.timezone(literal_column("'UTC'"), CoilModel.deletion_date),
+        literal_column("'[)'"),
+    )
+
+
+Index("ix_coils_stored_period", stored_period(), postgresql_using="gist")
+
+event.listen(CoilModel.__table__, "before_create", configure_partitioning)
+event.listen(CoilModel.__table__, "after_create", create_initial_partitions)
@@ -0,0 +1,22 @@
+from datetime import date
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class CoilDailyStatisticsModel(Base):
+    __tablename__ = "coil_daily_statistics"
+
+    day: Mapped[date] = mapped_column(primary_key=True)
+    active_count: Mapped[int] = mapped_column(default=0)
+    total_weight: Mapped[float] = mapped_column(default=0)
+    added_count: Mapped[int] = mapped_column(default=0)
+    removed_count: Mapped[int] = mapped_column(default=0)
+    removed_weight: Mapped[float] = mapped_column(default=0)
+    length_min: Mapped[float | None]
+    length_max: Mapped[float | None]
+    length_sum: Mapped[float] = mapped_column(default=0)
+    weight_min: Mapped[float | None]
+    weight_max: Mapped[float | None]
+    weight_sum: Mapped[float] = mapped_column(default=0)
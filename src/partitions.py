@@ -0,0 +1,203 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Connection, PrimaryKeyConstraint, Table, text
+
+from src.config import settings
+
+PARTITION_MONTHS = {"month": 1, "quarter": 3}
+BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+Partition = Tuple[str, Optional[datetime], Optional[datetime]]
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    months = PARTITION_MONTHS[interval]
+    month = (moment.month - 1) // months * months + 1
+    return datetime(moment.year, month, 1)
+
+
+def period_after(start: datetime, interval: str) -> datetime:
+    month = start.month - 1 + PARTITION_MONTHS[interval]
+    return datetime(start.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def configure_partitioning(table: Table, connection: Connection, **kw):
+    partitioned = bool(settings.coils_partition_interval)
+    partition_by = "RANGE (creation_date)" if partitioned else None
+    table.dialect_options["postgresql"]["partition_by"] = partition_by
+    table.c.creation_date.primary_key = partitioned
+    table.append_constraint(
+        PrimaryKeyConstraint(
+            *(column for column in table.c if column.primary_key)
+        )
+    )
+
+
+def create_initial_partitions(
+    table: Table, connection: Connection, **kw
+) -> None:
+    if not settings.coils_partition_interval:
+        return
+
+    connection.execute(
+        text(
+            f"CREATE TABLE {default_partition_name(table.name)} "
+            f"PARTITION OF {table.name} DEFAULT"
+        )
+    )
+    ensure_partitions(connection, table.name)
+
+
+def is_partitioned(connection: Connection, table: str) -> bool:
+    query = text(
+        "SELECT 1 FROM pg_partitioned_table "
+        "WHERE partrelid = to_regclass(:table)"
+    )
+    return connection.execute(query, {"table": table}).first() is not None
+
+
+def list_partitions(connection: Connection, table: str) -> List[Partition]:
+    query = text(
+        "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+        "FROM pg_inherits "
+        "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(:table) "
+        "ORDER BY child.relname"
+    )
+    partitions: List[Partition] = []
+    rows: Sequence[Tuple[str, str]] = connection.execute(
+        query, {"table": table}
+    ).all()
+    for name, bound in rows:
+        match = BOUND_PATTERN.search(bound)
+        if match is None:
+            partitions.append((name, None, None))
+            continue
+        start, end = (
+            datetime.fromisoformat(value) for value in match.groups()
+        )
+        partitions.append((name, start, end))
+    return partitions
+
+
+def ensure_partitions(
+    connection: Connection,
+    table: str,
+    interval: Optional[str] = None,
+    ahead: Optional[int] = None,
+) -> List[str]:
+    interval = interval or settings.coils_partition_interval
+    if interval is None:
+        raise ValueError("Partition interval is not configured")
+    ahead = settings.coils_partitions_ahead if ahead is None else ahead
+    default = default_partition_name(table)
+
+    existing = {
+        start for _, start, _ in list_partitions(connection, table) if start
+    }
+    starts: Set[datetime] = set()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = period_start(now, interval)
+    for _ in range(ahead + 1):
+        starts.add(start)
+        start = period_after(start, interval)
+
+    stray = connection.execute(
+        text(
+            "SELECT DISTINCT date_trunc(:interval, creation_date) "
+            f"FROM {default}"
+        ),
+        {"interval": interval},
+    )
+    starts.update(stray.scalars())
+
+    created = []
+    for start in sorted(starts - existing):
+        name = partition_name(table, start)
+        create_partition(
+            connection,
+            table,
+            name,
+            start,
+            period_after(start, interval),
+        )
+        created.append(name)
+    return created
+
+
+def create_partition(
+    connection: Connection,
+    table: str,
+    name: str,
+    start: datetime,
+    end: datetime,
+) -> None:
+    bounds = {"start": start, "end": end}
+    in_range = "creation_date >= :start AND creation_date < :end"
+    default = default_partition_name(table)
+
+    connection.execute(
+        text(
+            f"CREATE TABLE {name} "
+            f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    connection.execute(
+        text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_range}"),
+        bounds,
+    )
+    connection.execute(text(f"DELETE FROM {default} WHERE {in_range}"), bounds)
+    connection.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') "
+            f"TO ('{end.isoformat()}')"
+        )
+    )
+
+
+def archive_partitions(
+    connection: Connection,
+    table: str,
+    older_than: timedelta,
+    drop: bool = False,
+) -> List[str]:
+    cutoff = datetime.now(timezone.utc) - older_than
+    archived = []
+    for name, _, end in list_partitions(connection, table):
+        if end is None or end > cutoff.replace(tzinfo=None):
+            continue
+
+        still_stored = connection.execute(
+            text(
+                f"SELECT 1 FROM {name} "
+                "WHERE deletion_date IS NULL OR deletion_date >= :cutoff "
+                "LIMIT 1"
+            ),
+            {"cutoff": cutoff},
+        ).first()
+        if still_stored is not None:
+            continue
+
+        connection.execute(
+            text(f"ALTER TABLE {table} DETACH PARTITION {name}")
+        )
+        if drop:
+            connection.execute(text(f"DROP TABLE {name}"))
+            archived.append(name)
+            continue
+
+        archive = f"{name}_archive"
+        connection.execute(text(f"ALTER TABLE {name} RENAME TO {archive}"))
+        archived.append(archive)
+    return archived
@@ -1,6 +1,7 @@
-from typing import TypeVar, Generic, List, Type
+from typing import TypeVar, Generic, List, Optional, Sequence, Type, Union
 
-from sqlalchemy import select
+from sqlalchemy import Row, Table, inspect, insert, select, text
+from sqlalchemy.sql.expression import ColumnElement, Select
 
 from src.database import SessionDep
 
@@ -10,15 +11,113 @@ ModelType = TypeVar("ModelType")
 class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
+        mapper = inspect(model, raiseerr=True)
+        self.table: Table = mapper.local_table
+        self.primary_key = mapper.primary_key[0]
 
-    async def get_all(self, session: SessionDep) -> List[ModelType]:
-        query = select(self.model)
+    async def get_all(
+        self,
+        session: SessionDep,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> List[Row]:
+        query = select(*self.table.c)
+        query = self._apply_keyset_pagination(query, limit, after)
         result = await session.execute(query)
-        return list(result.scalars().all())
+        return list(result.all())
 
-    async def add(self, session: SessionDep, data: dict) -> ModelType:
-        new_model = self.model(**data)
-        session.add(new_model)
+    async def estimate_count(self, session: SessionDep) -> Optional[int]:
+        query = text(
+            "SELECT coalesce("
+            "sum(reltuples) FILTER (WHERE reltuples >= 0), 0) AS estimate, "
+            "count(*) FILTER ("
+            "WHERE reltuples < 0 AND relkind = 'r' "
+            "AND pg_relation_size(oid) > 0) AS unanalyzed "
+            "FROM pg_class "
+            "WHERE oid = to_regclass(:table) OR oid IN ("
+            "SELECT inhrelid FROM pg_inherits "
+            "WHERE inhparent = to_regclass(:table))"
+        )
+        result = await session.execute(query, {"table": self.table.name})
+        row = result.one()
+        if row.unanalyzed:
+            return None
+        return round(row.estimate)
+
+    async def add(self, session: SessionDep, data: dict) -> Row:
+        row = await self._create(session, data)
+        await session.commit()
+        return row
+
+    async def add_many(
+        self, session: SessionDep, data: Sequence[dict]
+    ) -> List[Row]:
+        rows = await self._create_many(session, data)
         await session.commit()
-        await session.refresh(new_model)
-        return new_model
+        return rows
+
+    async def _create(self, session: SessionDep, data: dict) -> Row:
+        query = insert(self.table).values(**data).returning(*self.table.c)
+        result = await session.execute(query)
+        return result.one()
+
+    async def _create_many(
+        self, session: SessionDep, data: Sequence[dict]
+    ) -> List[Row]:
+        query = insert(self.table).returning(
+            *self.table.c, sort_by_parameter_order=True
+        )
+        result = await session.execute(query, list(data))
+        return list(result.all())
+
+    async def _copy_many(
+        self, session: SessionDep, data: Sequence[dict]
+    ) -> List[Row]:
+        table = self.table
+        columns = list(data[0])
+        column_list = ", ".join(columns)
+        staging = f"{table.name}_intake"
+        dialect = session.get_bind().dialect
+
+        await session.execute(
+            text(
+                f"CREATE TEMPORARY TABLE {staging} (ordinal integer, "
+                + ", ".join(
+                    f"{column} {table.c[column].type.compile(dialect)}"
+                    for column in columns
+                )
+                + ") ON COMMIT DROP"
+            )
+        )
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        assert driver_connection is not None
+        await driver_connection.copy_records_to_table(
+            staging,
+            records=[
+                (ordinal, *(item[column] for column in columns))
+                for ordinal, item in enumerate(data)
+            ],
+            columns=["ordinal", *columns],
+        )
+
+        query = text(
+            f"INSERT INTO {table.name} ({column_list}) "
+            f"SELECT {column_list} FROM {staging} ORDER BY ordinal "
+            f"RETURNING {', '.join(table.c.keys())}"
+        ).columns(*table.c)
+        result = await session.execute(query)
+        return sorted(
+            result.all(), key=lambda row: row._mapping[self.primary_key.name]
+        )
+
+    def _apply_keyset_pagination(
+        self,
+        query: Select,
+        limit: Optional[Union[int, ColumnElement[int]]],
+        after: Optional[Union[int, ColumnElement[int]]],
+    ) -> Select:
+        if after is not None:
+            query = query.where(self.primary_key > after)
+        return query.order_by(self.primary_key).limit(limit)
@@ -1,93 +1,433 @@
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
-from sqlalchemy.sql.expression import Select
-
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    Interval,
+    Row,
+    bindparam,
+    case,
+    cast,
+    extract,
+    func,
+    literal,
+    literal_column,
+    null,
+    select,
+    tablesample,
+    true,
+    type_coerce,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.sql.expression import (
+    ColumnElement,
+    CompoundSelect,
+    Select,
+    Update,
+)
+from sqlalchemy.sql.util import ClauseAdapter
+
+from src.config import settings
 from src.database import SessionDep
-from src.models.coil_model import CoilModel
+from src.models.coil_model import CoilModel, stored_period
 from src.repositories.base import BaseRepository
+from src.repositories.coil_statistics_repository import (
+    CoilStatisticsRepository,
+)
+from src.repositories.occupancy import (
+    OccupancyEvent,
+    bucket_after,
+    bucket_start,
+    sweep_occupancy,
+)
+from src.repositories.statement_cache import statement_cache
+from src.schemas.statistics_schema import (
+    StatisticsBackend,
+    StatisticsGranularity,
+)
+
+FilteredQuery = TypeVar("FilteredQuery", Select, Update)
 
 
 class CoilRepository(BaseRepository[CoilModel]):
+    _BASELINE_EVENT = 0
+    _CREATION_EVENT = 1
+    _DELETION_EVENT = 2
+    _DISTRIBUTION_METRICS = ("length", "weight", "storage_time")
+    _PERCENTILES = (0.5, 0.9, 0.99)
+    _PERCENTILE_NAMES = ("p50", "p90", "p99")
+
     def __init__(self):
         super().__init__(CoilModel)
+        self.statistics_repository = CoilStatisticsRepository()
 
-    async def delete(self, session: SessionDep, id: int) -> CoilModel:
-        model = await session.get(self.model, id)
-        if not model:
-            raise HTTPException(status_code=404, detail="Coil is not found")
-
-        if model.deletion_date:
+    async def add(self, session: SessionDep, data: dict) -> Row:
+        row = await self._create(session, data)
+        await self.statistics_repository.record_added(
+            session, row.creation_date.date(), [row]
+        )
+        await session.commit()
+        return row
+
+    async def add_many(
+        self, session: SessionDep, data: Sequence[dict]
+    ) -> List[Row]:
+        if len(data) >= settings.bulk_copy_threshold:
+            rows = await self._copy_many(session, data)
+        else:
+            rows = await self._create_many(session, data)
+
+        if rows:
+            await self.statistics_repository.record_added(
+                session, rows[0].creation_date.date(), rows
+            )
+        await session.commit()
+        return rows
+
+    async def delete(self, session: SessionDep, id: int) -> Row:
+        query = self._soft_delete_query().where(self.model.id == id)
+        rows = await self._soft_delete(session, query)
+        if not rows:
+            existing = select(self.model.id).where(self.model.id == id)
+            if await session.scalar(existing) is None:
+                raise HTTPException(
+                    status_code=404, detail="Coil is not found"
+                )
             raise HTTPException(status_code=400, detail="Coil already deleted")
 
-        model.deletion_date = datetime.now(timezone.utc)
         await session.commit()
-        return model
+        return rows[0]
+
+    async def delete_many(
+        self,
+        session: SessionDep,
+        ids: Optional[Sequence[int]] = None,
+        data: Optional[dict] = None,
+    ) -> Tuple[List[Row], List[int], List[int]]:
+        query = self._soft_delete_query()
+        if ids is not None:
+            query = query.where(self.model.id.in_(ids))
+        else:
+            query = self._apply_filters(query, data or {})
+        rows = await self._soft_delete(session, query)
+
+        already_deleted: List[int] = []
+        not_found: List[int] = []
+        remaining = sorted(set(ids or []) - {row.id for row in rows})
+        if remaining:
+            existing_query = select(self.model.id).where(
+                self.model.id.in_(remaining)
+            )
+            existing = set((await session.scalars(existing_query)).all())
+            already_deleted = [id for id in remaining if id in existing]
+            not_found = [id for id in remaining if id not in existing]
+
+        await session.commit()
+        return rows, already_deleted, not_found
 
     async def get_filtered(
+        self,
+        session: SessionDep,
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> List[Row]:
+        params = self._filter_params(data)
+        paginated, limited = after is not None, limit is not None
+        query = statement_cache.get(
+            ("filtered", frozenset(params), paginated, limited),
+            lambda: self._filtered_query(params, paginated, limited),
+        )
+        if paginated:
+            params["after"] = after
+        if limited:
+            params["limit"] = limit
+
+        result = await session.execute(query, params)
+        return list(result.all())
+
+    async def prepare_statements(self, session: SessionDep) -> None:
+        for after in (None, 0):
+            await self.get_all(session, 0, after)
+            await self.get_filtered(session, {}, 0, after)
+
+    async def count_filtered(
         self, session: SessionDep, data: dict
-    ) -> List[CoilModel]:
-        query = select(self.model)
-        query = self._apply_id_filters(query, data)
-        query = self._apply_dimension_filters(query, data)
-        query = self._apply_creation_date_filters(query, data)
-        query = self._apply_deletion_date_filters(query, data)
+    ) -> Dict[str, Any]:
+        params = self._filter_params(data)
+        query = statement_cache.get(
+            ("count", frozenset(params)),
+            lambda: self._count_filtered_query(params),
+        )
+        result = await session.execute(query, params)
+        return dict(result.one()._mapping)
+
+    async def get_as_of(
+        self,
+        session: SessionDep,
+        moment: datetime,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> List[Row]:
+        query = self._apply_as_of_filter(
+            select(*self.model.__table__.c), moment
+        )
+        query = self._apply_keyset_pagination(query, limit, after)
 
         result = await session.execute(query)
-        return list(result.scalars().all())
+        return list(result.all())
+
+    async def get_as_of_summary(
+        self, session: SessionDep, moment: datetime
+    ) -> Dict[str, Any]:
+        query = self._apply_as_of_filter(
+            select(
+                func.count().label("count"),
+                func.coalesce(func.sum(self.model.weight), 0.0).label(
+                    "total_weight"
+                ),
+                func.coalesce(func.sum(self.model.length), 0.0).label(
+                    "total_length"
+                ),
+            ),
+            moment,
+        )
+        result = await session.execute(query)
+        return dict(result.one()._mapping)
+
+    async def stream_filtered(
+        self, session: SessionDep, data: dict, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        query = self._apply_filters(select(*self.model.__table__.c), data)
+        query = query.order_by(self.model.id).execution_options(
+            yield_per=batch_size
+        )
+
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            yield rows
+
+    async def stream_occupancy_series(
+        self,
+        session: SessionDep,
+        start_date: datetime,
+        end_date: datetime,
+        granularity: StatisticsGranularity,
+        batch_size: int,
+    ) -> AsyncIterator[Sequence[Row]]:
+        query = self._occupancy_series_query(
+            start_date, end_date, granularity
+        ).execution_options(yield_per=batch_size)
+
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            yield rows
 
     async def get_statistics(
         self,
         session: SessionDep,
         start_date: datetime,
         end_date: datetime,
+        backend: StatisticsBackend = StatisticsBackend.SQL,
     ) -> Optional[Dict[str, Any]]:
-        query = select(self.model)
-        query = self._apply_period_filters(query, start_date, end_date)
-
-        check_query = select(func.count()).select_from(query.subquery())
-        result = await session.execute(check_query)
-        count = result.scalar() or 0
+        period_stats = await self.get_period_statistics(
+            session, start_date, end_date
+        )
 
-        if count == 0:
+        if period_stats["added_coils_count"] == 0:
             return None
 
-        count_stats = await self._calculate_count_statistics(session, query)
-        size_stats = await self._calculate_size_statistics(session, query)
-        storage_time_stats = await self._calculate_storage_time_statistics(
-            session, query
+        daily_occupancy = await self.get_daily_occupancy(
+            session, start_date, end_date, backend
         )
 
-        daily_stats = await self._get_statistics_by_day(
-            session, start_date, end_date
-        )
+        return {
+            **period_stats,
+            **self.summarize_daily_occupancy(daily_occupancy),
+        }
+
+    async def get_period_statistics(
+        self,
+        session: SessionDep,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, Any]:
+        query = self._period_statistics_query(start_date, end_date)
+        result = await session.execute(query)
+        row = result.one()
 
         return {
-            **count_stats,
-            **size_stats,
-            **storage_time_stats,
-            **daily_stats,
+            key: value if value is not None else 0
+            for key, value in row._mapping.items()
         }
 
-    def _apply_range_filter(
-        self, query: Select, data: dict, field_name: str, model_field: Any
+    async def get_daily_occupancy(
+        self,
+        session: SessionDep,
+        start_date: datetime,
+        end_date: datetime,
+        backend: StatisticsBackend = StatisticsBackend.SQL,
+    ) -> List[Tuple[date, int, float]]:
+        if backend == StatisticsBackend.SWEEP:
+            return await self._get_daily_occupancy_sweep(
+                session, start_date, end_date
+            )
+        if backend == StatisticsBackend.ROLLUP:
+            return await self._get_daily_occupancy_rollup(
+                session, start_date, end_date
+            )
+        return await self._get_daily_occupancy(session, start_date, end_date)
+
+    def summarize_daily_occupancy(
+        self, daily_occupancy: Sequence[Tuple[date, int, float]]
+    ) -> Dict[str, Any]:
+        extremes: Dict[str, Dict[str, Any]] = {
+            "min_count": {"value": float("inf"), "day": None},
+            "max_count": {"value": 0, "day": None},
+            "min_weight": {"value": float("inf"), "day": None},
+            "max_weight": {"value": 0, "day": None},
+        }
+
+        for day, count, total_weight in daily_occupancy:
+            self._update_extremes(
+                extremes, day, {"count": count, "total_weight": total_weight}
+            )
+
+        return {
+            "min_coils_date": extremes["min_count"]["day"],
+            "min_coils_count": extremes["min_count"]["value"],
+            "max_coils_date": extremes["max_count"]["day"],
+            "max_coils_count": extremes["max_count"]["value"],
+            "min_weight_date": extremes["min_weight"]["day"],
+            "min_weight_total": extremes["min_weight"]["value"],
+            "max_weight_date": extremes["max_weight"]["day"],
+            "max_weight_total": extremes["max_weight"]["value"],
+        }
+
+    def split_period_by_month(
+        self, start_date: datetime, end_date: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        start_date = self._normalize_datetime(start_date)
+        end_date = self._normalize_datetime(end_date)
+
+        day = start_date.date()
+        last_day = day + timedelta(
+            days=(end_date - start_date) // timedelta(days=1)
+        )
+        chunks = []
+        while day <= last_day:
+            chunk_start = datetime.combine(day, datetime.min.time())
+            chunk_end = min(
+                bucket_after(chunk_start.replace(day=1), "month")
+                - timedelta(days=1),
+                datetime.combine(last_day, datetime.min.time()),
+            )
+            chunks.append((chunk_start, chunk_end))
+            day = chunk_end.date() + timedelta(days=1)
+        return chunks
+
+    def _soft_delete_query(self) -> Update:
+        table = self.model.__table__
+        return (
+            update(table)
+            .where(table.c.deletion_date.is_(None))
+            .values(deletion_date=func.now())
+            .returning(*table.c)
+        )
+
+    async def _soft_delete(
+        self, session: SessionDep, query: Update
+    ) -> List[Row]:
+        result = await session.execute(query)
+        rows = sorted(result.all(), key=lambda row: row.id)
+
+        if rows:
+            await self.statistics_repository.record_removed(
+                session, rows[0].deletion_date.date(), rows
+            )
+        return rows
+
+    def _filter_params(self, data: dict) -> Dict[str, Any]:
+        return {key: value for key, value in data.items() if value}
+
+    def _filtered_query(
+        self, params: Dict[str, Any], paginated: bool, limited: bool
     ) -> Select:
+        query = self._apply_filters(
+            select(*self.model.__table__.c), self._bind_filters(params)
+        )
+        return self._apply_keyset_pagination(
+            query,
+            bindparam("limit", type_=Integer) if limited else None,
+            bindparam("after", type_=Integer) if paginated else None,
+        )
+
+    def _count_filtered_query(self, params: Dict[str, Any]) -> Select:
+        return self._apply_filters(
+            select(
+                func.count().label("count"),
+                func.coalesce(func.sum(self.model.weight), 0.0).label(
+                    "total_weight"
+                ),
+                func.coalesce(func.sum(self.model.length), 0.0).label(
+                    "total_length"
+                ),
+            ),
+            self._bind_filters(params),
+        )
+
+    def _bind_filters(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: bindparam(key) for key in params}
+
+    def _apply_filters(
+        self, query: FilteredQuery, data: dict
+    ) -> FilteredQuery:
+        query = self._apply_id_filters(query, data)
+        query = self._apply_dimension_filters(query, data)
+        query = self._apply_creation_date_filters(query, data)
+        query = self._apply_deletion_date_filters(query, data)
+        return query
+
+    def _apply_range_filter(
+        self,
+        query: FilteredQuery,
+        data: dict,
+        field_name: str,
+        model_field: Any,
+    ) -> FilteredQuery:
         min_key = f"{field_name}_min"
         max_key = f"{field_name}_max"
 
-        if data.get(min_key):
+        if data.get(min_key) is not None:
             query = query.where(model_field >= data[min_key])
-        if data.get(max_key):
+        if data.get(max_key) is not None:
             query = query.where(model_field <= data[max_key])
         return query
 
-    def _apply_id_filters(self, query: Select, data: dict) -> Select:
+    def _apply_id_filters(
+        self, query: FilteredQuery, data: dict
+    ) -> FilteredQuery:
         query = self._apply_range_filter(query, data, "id", self.model.id)
         return query
 
-    def _apply_dimension_filters(self, query: Select, data: dict) -> Select:
+    def _apply_dimension_filters(
+        self, query: FilteredQuery, data: dict
+    ) -> FilteredQuery:
         query = self._apply_range_filter(
             query, data, "length", self.model.length
         )
@@ -97,28 +437,32 @@ class CoilRepository(BaseRepository[CoilModel]):
         return query
 
     def _apply_creation_date_filters(
-        self, query: Select, data: dict
-    ) -> Select:
+        self, query: FilteredQuery, data: dict
+    ) -> FilteredQuery:
         query = self._apply_range_filter(
             query, data, "creation_date", self.model.creation_date
         )
         return query
 
     def _apply_deletion_date_filters(
-        self, query: Select, data: dict
-    ) -> Select:
-        if data.get("deletion_date_min"):
+        self, query: FilteredQuery, data: dict
+    ) -> FilteredQuery:
+        if data.get("deletion_date_min") is not None:
             query = query.where(
                 self.model.deletion_date.is_not(None),
                 self.model.deletion_date >= data["deletion_date_min"],
             )
-        if data.get("deletion_date_max"):
+        if data.get("deletion_date_max") is not None:
             query = query.where(
                 self.model.deletion_date.is_not(None),
                 self.model.deletion_date <= data["deletion_date_max"],
             )
         return query
 
+    def _apply_as_of_filter(self, query: Select, moment: datetime) -> Select:
+        stored_at = cast(self._normalize_datetime(moment), DateTime)
+        return query.where(stored_period().op("@>")(stored_at))
+
     def _apply_period_filters(
         self,
         query: Select,
@@ -137,138 +481,419 @@ class CoilRepository(BaseRepository[CoilModel]):
         return query
 
     def _normalize_datetime(self, dt: datetime) -> datetime:
-        return dt.replace(tzinfo=None)
+        if dt.tzinfo is None:
+            return dt
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
 
-    async def _calculate_count_statistics(
-        self, session: SessionDep, query: Select
-    ) -> Dict[str, int]:
-        query = select(func.count()).select_from(query.subquery())
-        result = await session.execute(query)
-        added_count = result.scalar() or 0
-
-        query = select(func.count()).where(
-            self.model.deletion_date.is_not(None)
+    async def get_distribution(
+        self,
+        session: SessionDep,
+        start_date: datetime,
+        end_date: datetime,
+        buckets: int,
+        sample_percent: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        query = self._distribution_query(
+            start_date, end_date, buckets, sample_percent
         )
         result = await session.execute(query)
-        removed_count = result.scalar() or 0
+        rows = result.all()
+        bounds = rows[0]
 
-        return {
-            "added_coils_count": added_count,
-            "removed_coils_count": removed_count,
+        histograms: Dict[str, Dict[int, int]] = {
+            metric: {} for metric in self._DISTRIBUTION_METRICS
         }
-
-    async def _calculate_size_statistics(
-        self, session: SessionDep, query: Select
-    ) -> Dict[str, float]:
-        subquery = query.subquery()
-        query = select(
-            func.avg(subquery.c.length).label("avg_length"),
-            func.avg(subquery.c.weight).label("avg_weight"),
-            func.max(subquery.c.length).label("max_length"),
-            func.max(subquery.c.weight).label("max_weight"),
-            func.min(subquery.c.length).label("min_length"),
-            func.min(subquery.c.weight).label("min_weight"),
-            func.sum(subquery.c.weight).label("total_weight"),
-        ).select_from(subquery)
-
-        result = await session.execute(query)
-        row = result.fetchone()
-
-        if not row:
-            return {
-                "avg_length": 0,
-                "avg_weight": 0,
-                "max_length": 0,
-                "max_weight": 0,
-                "min_length": 0,
-                "min_weight": 0,
-                "total_weight": 0,
+        for row in rows:
+            if row.metric is not None:
+                histograms[row.metric][row.bucket] = row.bucket_count
+
+        scale = 100 / sample_percent if sample_percent else 1
+        distribution: Dict[str, Any] = {
+            "coils_count": round(bounds.coils_count * scale),
+            "removed_coils_count": round(bounds.removed_coils_count * scale),
+        }
+        for metric in self._DISTRIBUTION_METRICS:
+            low = getattr(bounds, f"{metric}_min")
+            high = getattr(bounds, f"{metric}_max")
+            percentiles = getattr(bounds, f"{metric}_percentiles") or [
+                None
+            ] * len(self._PERCENTILES)
+            histogram = []
+            if low is not None:
+                width = (high - low) / buckets
+                histogram = [
+                    {
+                        "lower": low + width * index,
+                        "upper": low + width * (index + 1),
+                        "count": round(
+                            histograms[metric].get(index + 1, 0) * scale
+                        ),
+                    }
+                    for index in range(buckets)
+                ]
+            distribution[metric] = {
+                "min": low,
+                "max": high,
+                **dict(zip(self._PERCENTILE_NAMES, percentiles)),
+                "histogram": histogram,
             }
+        return distribution
 
-        return dict(row._mapping)
+    def _period_statistics_query(
+        self, start_date: datetime, end_date: datetime
+    ) -> Select:
+        removed = self.model.deletion_date <= self._normalize_datetime(
+            end_date
+        )
+        storage_time = self._storage_time()
 
-    async def _calculate_storage_time_statistics(
-        self, session: SessionDep, query: Select
-    ) -> Dict[str, float]:
         query = select(
-            func.max(self.model.deletion_date - self.model.creation_date)
-        )
-        result = await session.execute(query)
-        max_storage_time_delta = result.scalar() or 0
-        max_storage_time = (
-            max_storage_time_delta.total_seconds()
-            if isinstance(max_storage_time_delta, timedelta)
-            else 0
+            func.count().label("added_coils_count"),
+            func.count().filter(removed).label("removed_coils_count"),
+            func.avg(self.model.length).label("avg_length"),
+            func.avg(self.model.weight).label("avg_weight"),
+            func.max(self.model.length).label("max_length"),
+            func.max(self.model.weight).label("max_weight"),
+            func.min(self.model.length).label("min_length"),
+            func.min(self.model.weight).label("min_weight"),
+            func.sum(self.model.weight).label("total_weight"),
+            func.max(storage_time).filter(removed).label("max_storage_time"),
+            func.min(storage_time).filter(removed).label("min_storage_time"),
         )
+        return self._apply_period_filters(query, start_date, end_date)
 
-        query = select(
-            func.min(self.model.deletion_date - self.model.creation_date)
+    def _distribution_query(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        buckets: int,
+        sample_percent: Optional[float] = None,
+    ) -> Select:
+        removed = self.model.deletion_date <= self._normalize_datetime(
+            end_date
         )
-        result = await session.execute(query)
-        min_storage_time_delta = result.scalar() or 0
-        min_storage_time = (
-            min_storage_time_delta.total_seconds()
-            if isinstance(min_storage_time_delta, timedelta)
-            else 0
+        storage_time = case(
+            (removed, self._storage_time()),
+        )
+        period = self._apply_period_filters(
+            select(
+                self.model.length,
+                self.model.weight,
+                storage_time.label("storage_time"),
+            ),
+            start_date,
+            end_date,
+        )
+        if sample_percent:
+            sampled = tablesample(
+                self.model.__table__,
+                func.system(literal(sample_percent, Float)),
+                name="sampled_coils",
+            )
+            period = ClauseAdapter(sampled).traverse(period)
+        coils = period.cte("period_coils")
+
+        aggregates: List[ColumnElement[Any]] = [
+            func.count().label("coils_count"),
+            func.count(coils.c.storage_time).label("removed_coils_count"),
+        ]
+        for metric in self._DISTRIBUTION_METRICS:
+            column = coils.c[metric]
+            aggregates += [
+                func.min(column).label(f"{metric}_min"),
+                func.max(column).label(f"{metric}_max"),
+                type_coerce(
+                    func.percentile_cont(
+                        array(list(self._PERCENTILES))
+                    ).within_group(column),
+                    ARRAY(Float),
+                ).label(f"{metric}_percentiles"),
+            ]
+        bounds = select(*aggregates).cte("bounds")
+
+        histograms = []
+        for metric in self._DISTRIBUTION_METRICS:
+            column = coils.c[metric]
+            low = bounds.c[f"{metric}_min"]
+            high = bounds.c[f"{metric}_max"]
+            bucket = case(
+                (
+                    high > low,
+                    func.least(
+                        func.width_bucket(column, low, high, buckets), buckets
+                    ),
+                ),
+                else_=1,
+            )
+            histograms.append(
+                select(
+                    literal(metric).label("metric"),
+                    bucket.label("bucket"),
+                    func.count().label("bucket_count"),
+                )
+                .select_from(coils.join(bounds, true()))
+                .where(column.is_not(None))
+                .group_by(bucket)
+            )
+        histogram = union_all(*histograms).subquery("histogram")
+
+        return select(
+            bounds,
+            histogram.c.metric,
+            histogram.c.bucket,
+            histogram.c.bucket_count,
+        ).select_from(bounds.outerjoin(histogram, true()))
+
+    def _storage_time(self) -> ColumnElement:
+        return cast(
+            extract(
+                "epoch", self.model.deletion_date - self.model.creation_date
+            ),
+            Float,
         )
 
-        return {
-            "max_storage_time": max_storage_time,
-            "min_storage_time": min_storage_time,
-        }
+    async def _get_daily_occupancy(
+        self,
+        session: SessionDep,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[Tuple[date, int, float]]:
+        query = self._daily_occupancy_query(start_date, end_date)
+        result = await session.execute(query)
+        return [(row.day, row.coils_count, row.total_weight) for row in result]
 
-    async def _get_statistics_by_day(
+    async def _get_daily_occupancy_sweep(
         self,
         session: SessionDep,
         start_date: datetime,
         end_date: datetime,
-    ) -> Dict[str, Any]:
-        extremes: Dict[str, Dict[str, Any]] = {
-            "min_count": {"value": float("inf"), "day": None},
-            "max_count": {"value": 0, "day": None},
-            "min_weight": {"value": float("inf"), "day": None},
-            "max_weight": {"value": 0, "day": None},
-        }
+    ) -> List[Tuple[date, int, float]]:
+        start_date = self._normalize_datetime(start_date)
+        end_date = self._normalize_datetime(end_date)
 
-        current_date = start_date
-        while current_date <= end_date:
-            date = current_date.date()
-            day_stats = await self._get_single_day_statistics(session, date)
-            self._update_extremes(extremes, date, day_stats)
-            current_date += timedelta(days=1)
+        origin = datetime.combine(start_date.date(), datetime.min.time())
+        days = (end_date - start_date) // timedelta(days=1) + 1
+        horizon = origin + timedelta(days=days)
 
-        return {
-            "min_coils_date": extremes["min_count"]["day"],
-            "min_coils_count": extremes["min_count"]["value"],
-            "max_coils_date": extremes["max_count"]["day"],
-            "max_coils_count": extremes["max_count"]["value"],
-            "min_weight_date": extremes["min_weight"]["day"],
-            "min_weight_total": extremes["min_weight"]["value"],
-            "max_weight_date": extremes["max_weight"]["day"],
-            "max_weight_total": extremes["max_weight"]["value"],
-        }
+        result = await session.execute(
+            self._occupancy_events_query(origin, horizon)
+        )
+
+        baseline_count, baseline_weight = 0, 0.0
+        creations: List[OccupancyEvent] = []
+        deletions: List[OccupancyEvent] = []
+        for row in result:
+            if row.kind == self._BASELINE_EVENT:
+                baseline_count, baseline_weight = row.coils, row.weight
+            elif row.kind == self._CREATION_EVENT:
+                creations.append((row.moment, row.weight))
+            else:
+                deletions.append((row.moment, row.weight))
+
+        buckets = sweep_occupancy(
+            origin,
+            timedelta(days=1),
+            days,
+            baseline_count,
+            baseline_weight,
+            creations,
+            deletions,
+        )
+        return [
+            (moment.date(), count, weight) for moment, count, weight in buckets
+        ]
+
+    async def _get_daily_occupancy_rollup(
+        self,
+        session: SessionDep,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[Tuple[date, int, float]]:
+        start_date = self._normalize_datetime(start_date)
+        end_date = self._normalize_datetime(end_date)
 
-    async def _get_single_day_statistics(
-        self, session: SessionDep, date: date
-    ) -> Dict[str, float]:
-        day_start = datetime.combine(date, datetime.min.time())
-        day_end = datetime.combine(date, datetime.max.time())
+        first_day = start_date.date()
+        last_day = first_day + timedelta(
+            days=(end_date - start_date) // timedelta(days=1)
+        )
+        today = datetime.now(timezone.utc).date()
 
-        day_query = select(self.model).where(
-            (self.model.creation_date <= day_end)
+        daily_occupancy = []
+        if first_day < today:
+            daily_occupancy += await self.statistics_repository.get_daily(
+                session, first_day, min(last_day, today - timedelta(days=1))
+            )
+        if last_day >= today:
+            daily_occupancy += await self._get_daily_occupancy(
+                session,
+                datetime.combine(max(first_day, today), datetime.min.time()),
+                datetime.combine(last_day, datetime.min.time()),
+            )
+        return daily_occupancy
+
+    def _occupancy_events_query(
+        self, origin: datetime, horizon: datetime
+    ) -> CompoundSelect:
+        baseline = select(
+            literal(self._BASELINE_EVENT).label("kind"),
+            null().label("moment"),
+            func.count().label("coils"),
+            func.coalesce(func.sum(self.model.weight), 0.0).label("weight"),
+        ).where(
+            (self.model.creation_date < origin)
             & (
                 (self.model.deletion_date.is_(None))
-                | (self.model.deletion_date >= day_start)
+                | (self.model.deletion_date >= origin)
             )
         )
+        creations = select(
+            literal(self._CREATION_EVENT),
+            self.model.creation_date,
+            literal(1),
+            self.model.weight,
+        ).where(
+            (self.model.creation_date >= origin)
+            & (self.model.creation_date < horizon)
+        )
+        deletions = select(
+            literal(self._DELETION_EVENT),
+            func.timezone("UTC", self.model.deletion_date),
+            literal(1),
+            self.model.weight,
+        ).where(
+            (self.model.deletion_date >= origin)
+            & (self.model.deletion_date < horizon)
+        )
+        return union_all(baseline, creations, deletions)
 
-        result = await session.execute(day_query)
-        coils_for_day = list(result.scalars().all())
+    def _daily_occupancy_query(
+        self, start_date: datetime, end_date: datetime
+    ) -> Select:
+        start_date = self._normalize_datetime(start_date)
+        end_date = self._normalize_datetime(end_date)
 
-        return {
-            "count": len(coils_for_day),
-            "total_weight": sum(coil.weight for coil in coils_for_day),
-        }
+        days = select(
+            cast(
+                func.generate_series(
+                    cast(start_date, DateTime),
+                    cast(end_date, DateTime),
+                    cast(timedelta(days=1), Interval),
+                ),
+                Date,
+            ).label("day")
+        ).subquery("days")
+        day_start = cast(days.c.day, DateTime)
+        day_end = day_start + cast(timedelta(days=1), Interval)
+
+        return (
+            select(
+                days.c.day,
+                func.count(self.model.id).label("coils_count"),
+                func.coalesce(func.sum(self.model.weight), 0).label(
+                    "total_weight"
+                ),
+            )
+            .select_from(days)
+            .outerjoin(
+                self.model,
+                (self.model.creation_date < day_end)
+                & (
+                    (self.model.deletion_date.is_(None))
+                    | (self.model.deletion_date >= day_start)
+                ),
+            )
+            .group_by(days.c.day)
+            .order_by(days.c.day)
+        )
+
+    def _occupancy_series_query(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        granularity: StatisticsGranularity,
+    ) -> Select:
+        unit = granularity.value
+        origin = bucket_start(self._normalize_datetime(start_date), unit)
+        last = bucket_start(self._normalize_datetime(end_date), unit)
+        horizon = bucket_after(last, unit)
+
+        coils = self._apply_period_filters(
+            select(
+                func.greatest(
+                    func.date_trunc(unit, self.model.creation_date),
+                    cast(origin, DateTime),
+                ).label("created_at"),
+                func.date_trunc(
+                    unit, func.timezone("UTC", self.model.deletion_date)
+                ).label("deleted_at"),
+                self.model.weight,
+            ),
+            origin,
+            horizon,
+        ).cte("period_coils")
+
+        added = select(
+            coils.c.created_at.label("bucket"),
+            func.count().label("added"),
+            literal(0).label("removed"),
+            func.sum(coils.c.weight).label("added_weight"),
+            literal(0.0).label("removed_weight"),
+        ).group_by(coils.c.created_at)
+        removed = (
+            select(
+                coils.c.deleted_at,
+                literal(0),
+                func.count(),
+                literal(0.0),
+                func.sum(coils.c.weight),
+            )
+            .where(coils.c.deleted_at.is_not(None))
+            .group_by(coils.c.deleted_at)
+        )
+        events = union_all(added, removed).subquery("events")
+
+        deltas = (
+            select(
+                events.c.bucket,
+                func.sum(events.c.added).label("added"),
+                func.sum(events.c.removed).label("removed"),
+                func.sum(events.c.added_weight).label("added_weight"),
+                func.sum(events.c.removed_weight).label("removed_weight"),
+            )
+            .group_by(events.c.bucket)
+            .subquery("deltas")
+        )
+        buckets = select(
+            func.generate_series(
+                cast(origin, DateTime),
+                cast(last, DateTime),
+                literal_column(f"INTERVAL '1 {unit}'"),
+            ).label("bucket")
+        ).subquery("buckets")
+
+        removed_count = func.coalesce(deltas.c.removed, 0)
+        removed_weight = func.coalesce(deltas.c.removed_weight, 0.0)
+        running_count = func.sum(
+            func.coalesce(deltas.c.added, 0) - removed_count
+        ).over(order_by=buckets.c.bucket)
+        running_weight = func.sum(
+            func.coalesce(deltas.c.added_weight, 0.0) - removed_weight
+        ).over(order_by=buckets.c.bucket)
+
+        return (
+            select(
+                buckets.c.bucket,
+                cast(running_count + removed_count, Integer).label(
+                    "active_count"
+                ),
+                cast(running_weight + removed_weight, Float).label(
+                    "total_weight"
+                ),
+            )
+            .select_from(buckets)
+            .outerjoin(deltas, deltas.c.bucket == buckets.c.bucket)
+            .order_by(buckets.c.bucket)
+        )
 
     def _update_extremes(
         self,
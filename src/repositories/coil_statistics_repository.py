@@ -0,0 +1,271 @@
+from datetime import date, timedelta
+from typing import List, Sequence, Tuple
+from typing import cast as typing_cast
+
+from sqlalchemy import (
+    Date,
+    Float,
+    Integer,
+    Row,
+    cast,
+    delete,
+    func,
+    literal,
+    null,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.sql.expression import ColumnElement
+
+from src.database import SessionDep
+from src.models.coil_model import CoilModel
+from src.models.coil_statistics_model import CoilDailyStatisticsModel
+from src.repositories.base import BaseRepository
+
+
+class CoilStatisticsRepository(BaseRepository[CoilDailyStatisticsModel]):
+    def __init__(self):
+        super().__init__(CoilDailyStatisticsModel)
+
+    async def record_added(
+        self,
+        session: SessionDep,
+        day: date,
+        coils: Sequence[CoilModel | Row],
+    ) -> None:
+        if not coils:
+            return
+
+        count = len(coils)
+        lengths = [coil.length for coil in coils]
+        weights = [coil.weight for coil in coils]
+        carry_count, carry_weight = self._carry(day)
+
+        query = insert(self.model).values(
+            day=day,
+            active_count=carry_count + count,
+            total_weight=carry_weight + sum(weights),
+            added_count=count,
+            removed_count=0,
+            removed_weight=0,
+            length_min=min(lengths),
+            length_max=max(lengths),
+            length_sum=sum(lengths),
+            weight_min=min(weights),
+            weight_max=max(weights),
+            weight_sum=sum(weights),
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.day],
+            set_={
+                "active_count": self.model.active_count + count,
+                "total_weight": self.model.total_weight + sum(weights),
+                "added_count": self.model.added_count + count,
+                "length_min": func.least(
+                    self.model.length_min, query.excluded.length_min
+                ),
+                "length_max": func.greatest(
+                    self.model.length_max, query.excluded.length_max
+                ),
+                "length_sum": self.model.length_sum + sum(lengths),
+                "weight_min": func.least(
+                    self.model.weight_min, query.excluded.weight_min
+                ),
+                "weight_max": func.greatest(
+                    self.model.weight_max, query.excluded.weight_max
+                ),
+                "weight_sum": self.model.weight_sum + sum(weights),
+            },
+        )
+        await session.execute(query)
+
+    async def record_removed(
+        self,
+        session: SessionDep,
+        day: date,
+        coils: Sequence[CoilModel | Row],
+    ) -> None:
+        if not coils:
+            return
+
+        count = len(coils)
+        weight = sum(coil.weight for coil in coils)
+        carry_count, carry_weight = self._carry(day)
+
+        query = insert(self.model).values(
+            day=day,
+            active_count=carry_count,
+            total_weight=carry_weight,
+            added_count=0,
+            removed_count=count,
+            removed_weight=weight,
+            length_sum=0,
+            weight_sum=0,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.day],
+            set_={
+                "removed_count": self.model.removed_count + count,
+                "removed_weight": self.model.removed_weight + weight,
+            },
+        )
+        await session.execute(query)
+
+    async def get_daily(
+        self, session: SessionDep, first_day: date, last_day: date
+    ) -> List[Tuple[date, int, float]]:
+        previous_day = (
+            select(func.max(self.model.day))
+            .where(self.model.day < first_day)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                self.model.day,
+                self.model.active_count,
+                self.model.total_weight,
+                self.model.removed_count,
+                self.model.removed_weight,
+            )
+            .where(
+                self.model.day >= func.coalesce(previous_day, first_day),
+                self.model.day <= last_day,
+            )
+            .order_by(self.model.day)
+        )
+        result = await session.execute(query)
+        rows = list(result)
+
+        carry_count, carry_weight = 0, 0.0
+        while rows and rows[0].day < first_day:
+            row = rows.pop(0)
+            carry_count = row.active_count - row.removed_count
+            carry_weight = row.total_weight - row.removed_weight
+
+        snapshots = {row.day: row for row in rows}
+        daily = []
+        for offset in range((last_day - first_day).days + 1):
+            day = first_day + timedelta(days=offset)
+            snapshot = snapshots.get(day)
+            if snapshot is None:
+                daily.append((day, carry_count, carry_weight))
+                continue
+
+            daily.append((day, snapshot.active_count, snapshot.total_weight))
+            carry_count = snapshot.active_count - snapshot.removed_count
+            carry_weight = snapshot.total_weight - snapshot.removed_weight
+
+        return daily
+
+    async def rebuild(self, session: SessionDep) -> int:
+        await session.execute(
+            text(f"LOCK TABLE {CoilModel.__tablename__} IN SHARE MODE")
+        )
+        await session.execute(delete(self.model))
+
+        added = select(
+            cast(CoilModel.creation_date, Date).label("day"),
+            literal(1).label("added"),
+            literal(0).label("removed"),
+            CoilModel.weight.label("added_weight"),
+            literal(0.0).label("removed_weight"),
+            CoilModel.length.label("length"),
+            CoilModel.weight.label("weight"),
+        )
+        removed = select(
+            cast(func.timezone("UTC", CoilModel.deletion_date), Date),
+            literal(0),
+            literal(1),
+            literal(0.0),
+            CoilModel.weight,
+            null(),
+            null(),
+        ).where(CoilModel.deletion_date.is_not(None))
+        events = union_all(added, removed).subquery("events")
+
+        daily = (
+            select(
+                events.c.day,
+                func.sum(events.c.added).label("added_count"),
+                func.sum(events.c.removed).label("removed_count"),
+                func.sum(events.c.added_weight).label("added_weight"),
+                func.sum(events.c.removed_weight).label("removed_weight"),
+                func.min(events.c.length).label("length_min"),
+                func.max(events.c.length).label("length_max"),
+                func.coalesce(func.sum(events.c.length), 0).label(
+                    "length_sum"
+                ),
+                func.min(events.c.weight).label("weight_min"),
+                func.max(events.c.weight).label("weight_max"),
+                func.coalesce(func.sum(events.c.weight), 0).label(
+                    "weight_sum"
+                ),
+            )
+            .group_by(events.c.day)
+            .subquery("daily")
+        )
+        running_count = func.sum(
+            daily.c.added_count - daily.c.removed_count
+        ).over(order_by=daily.c.day)
+        running_weight = func.sum(
+            daily.c.added_weight - daily.c.removed_weight
+        ).over(order_by=daily.c.day)
+
+        snapshots = select(
+            daily.c.day,
+            cast(running_count + daily.c.removed_count, Integer),
+            cast(running_weight + daily.c.removed_weight, Float),
+            daily.c.added_count,
+            daily.c.removed_count,
+            daily.c.removed_weight,
+            daily.c.length_min,
+            daily.c.length_max,
+            daily.c.length_sum,
+            daily.c.weight_min,
+            daily.c.weight_max,
+            daily.c.weight_sum,
+        )
+        result = await session.execute(
+            insert(self.model).from_select(
+                [
+                    "day",
+                    "active_count",
+                    "total_weight",
+                    "added_count",
+                    "removed_count",
+                    "removed_weight",
+                    "length_min",
+                    "length_max",
+                    "length_sum",
+                    "weight_min",
+                    "weight_max",
+                    "weight_sum",
+                ],
+                snapshots,
+            )
+        )
+        await session.commit()
+        return typing_cast(CursorResult, result).rowcount
+
+    def _carry(self, day: date) -> Tuple[ColumnElement, ColumnElement]:
+        previous = (
+            select(self.model)
+            .where(self.model.day < day)
+            .order_by(self.model.day.desc())
+            .limit(1)
+            .with_for_update()
+            .subquery("previous")
+        )
+        carry_count = select(
+            previous.c.active_count - previous.c.removed_count
+        ).scalar_subquery()
+        carry_weight = select(
+            previous.c.total_weight - previous.c.removed_weight
+        ).scalar_subquery()
+        return (
+            func.coalesce(carry_count, 0),
+            func.coalesce(carry_weight, 0.0),
+        )
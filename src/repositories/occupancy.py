@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Iterable, List, Tuple
+
+OccupancyEvent = Tuple[datetime, float]
+OccupancyBucket = Tuple[datetime, int, float]
+
+
+def sweep_occupancy(
+    origin: datetime,
+    bucket: timedelta,
+    buckets: int,
+    baseline_count: int,
+    baseline_weight: float,
+    creations: Iterable[OccupancyEvent],
+    deletions: Iterable[OccupancyEvent],
+) -> List[OccupancyBucket]:
+    """Running occupancy per bucket from creation/deletion events.
+
+    A coil is counted in every bucket from the one it was created in up
+    to and including the one it was deleted in, so a deletion only
+    takes effect from the following bucket. ``baseline_*`` describe the
+    coils that were already stored at ``origin``.
+    """
+    count_deltas = [0] * buckets
+    weight_deltas = [0.0] * buckets
+    if buckets:
+        count_deltas[0] = baseline_count
+        weight_deltas[0] = baseline_weight
+
+    for moment, weight in creations:
+        index = (moment - origin) // bucket
+        if 0 <= index < buckets:
+            count_deltas[index] += 1
+            weight_deltas[index] += weight
+
+    for moment, weight in deletions:
+        index = (moment - origin) // bucket + 1
+        if 0 < index < buckets:
+            count_deltas[index] -= 1
+            weight_deltas[index] -= weight
+
+    return [
+        (origin + bucket * index, count, weight)
+        for index, (count, weight) in enumerate(
+            zip(accumulate(count_deltas), accumulate(weight_deltas))
+        )
+    ]
+
+
+def bucket_start(moment: datetime, unit: str) -> datetime:
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if unit == "hour":
+        return moment
+    moment = moment.replace(hour=0)
+    if unit == "week":
+        return moment - timedelta(days=moment.weekday())
+    if unit == "month":
+        return moment.replace(day=1)
+    return moment
+
+
+def bucket_after(moment: datetime, unit: str) -> datetime:
+    if unit == "hour":
+        return moment + timedelta(hours=1)
+    if unit == "week":
+        return moment + timedelta(weeks=1)
+    if unit == "month":
+        if moment.month == 12:
+            return moment.replace(year=moment.year + 1, month=1)
+        return moment.replace(month=moment.month + 1)
+    return moment + timedelta(days=1)
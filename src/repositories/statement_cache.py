@@ -0,0 +1,37 @@
+from typing import Any, Callable, Dict, Hashable
+
+from sqlalchemy.sql.expression import Executable
+
+
+class StatementCache:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._statements: Dict[Hashable, Executable] = {}
+
+    def get(
+        self, key: Hashable, build: Callable[[], Executable]
+    ) -> Executable:
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = build()
+            self.misses += 1
+            return statement
+
+        self.hits += 1
+        return statement
+
+    def clear(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._statements.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._statements),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+statement_cache = StatementCache()
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+from typing_extensions import Annotated
+
+from src.schemas.coil_schema import CoilFilterSchema, CoilPageSchema
+from src.schemas.pagination_schema import PaginationSchema
+from src.schemas.statistics_schema import (
+    StatisticsBackend,
+    StatisticsResponse,
+)
+
+
+class FilteredQuerySpec(BaseModel):
+    type: Literal["filtered"]
+    name: str = Field(..., min_length=1, max_length=100)
+    filters: CoilFilterSchema = Field(
+        default_factory=lambda: CoilFilterSchema()
+    )
+    pagination: PaginationSchema = Field(
+        default_factory=lambda: PaginationSchema()
+    )
+
+
+class StatisticsQuerySpec(BaseModel):
+    type: Literal["statistics"]
+    name: str = Field(..., min_length=1, max_length=100)
+    start_date: datetime = Field(
+        default_factory=lambda: datetime.now() - timedelta(days=30)
+    )
+    end_date: datetime = Field(default_factory=datetime.now)
+    backend: StatisticsBackend = Field(StatisticsBackend.SQL)
+
+
+BatchQuerySpec = Annotated[
+    Union[FilteredQuerySpec, StatisticsQuerySpec],
+    Field(discriminator="type"),
+]
+
+
+class BatchRequest(BaseModel):
+    queries: List[BatchQuerySpec] = Field(..., min_length=1, max_length=50)
+
+    @model_validator(mode="after")
+    def check_names(self) -> "BatchRequest":
+        names = [query.name for query in self.queries]
+        if len(set(names)) != len(names):
+            raise ValueError("Query names must be unique")
+        return self
+
+
+class FilteredQueryResult(BaseModel):
+    type: Literal["filtered"]
+    status_code: int
+    detail: Optional[str] = None
+    data: Optional[CoilPageSchema] = None
+
+
+class StatisticsQueryResult(BaseModel):
+    type: Literal["statistics"]
+    status_code: int
+    detail: Optional[str] = None
+    data: Optional[StatisticsResponse] = None
+
+
+BatchQueryResult = Annotated[
+    Union[FilteredQueryResult, StatisticsQueryResult],
+    Field(discriminator="type"),
+]
+
+
+class BatchResponse(BaseModel):
+    results: Dict[str, BatchQueryResult]
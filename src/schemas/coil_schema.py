@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
+from typing_extensions import TypedDict
 
 
 class CoilAddSchema(BaseModel):
@@ -15,6 +17,28 @@ class CoilSchema(CoilAddSchema):
     deletion_date: datetime | None
 
 
+class CoilRow(TypedDict):
+    id: int
+    length: float
+    weight: float
+    creation_date: datetime
+    deletion_date: Optional[datetime]
+
+
+class CoilPage(TypedDict):
+    items: List[CoilRow]
+    next_cursor: Optional[str]
+
+
+class CoilPageSchema(BaseModel):
+    items: List[CoilSchema]
+    next_cursor: Optional[str] = None
+
+
+coil_row_adapter = TypeAdapter(CoilRow)
+coil_page_adapter = TypeAdapter(CoilPage)
+
+
 class CoilFilterSchema(BaseModel):
     id_min: Optional[int] = Field(None, gt=0)
     id_max: Optional[int] = Field(None, gt=0)
@@ -26,3 +50,43 @@ class CoilFilterSchema(BaseModel):
     creation_date_max: Optional[datetime] = Field(None)
     deletion_date_min: Optional[datetime] = Field(None)
     deletion_date_max: Optional[datetime] = Field(None)
+
+
+class CoilBulkDeleteSchema(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filters: Optional[CoilFilterSchema] = Field(None)
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "CoilBulkDeleteSchema":
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Exactly one of ids or filters is required")
+        if self.filters is not None and not self.filters.model_dump(
+            exclude_none=True
+        ):
+            raise ValueError("At least one filter is required")
+        return self
+
+
+class CoilBulkDeleteResponse(BaseModel):
+    deleted: List[CoilSchema]
+    already_deleted: List[int] = []
+    not_found: List[int] = []
+
+
+class CoilCountSchema(BaseModel):
+    count: int
+    total_weight: Optional[float] = None
+    total_length: Optional[float] = None
+    approximate: bool = False
+
+
+class CoilAsOfSummarySchema(BaseModel):
+    ts: datetime
+    count: int
+    total_weight: float
+    total_length: float
+
+
+class CoilExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -0,0 +1,62 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class EnginePoolSchema(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+
+
+class PoolMetricsResponse(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    acquisitions: int
+    wait_time_total: float
+    wait_time_avg: float
+    wait_time_max: float
+    engines: Dict[str, EnginePoolSchema]
+
+
+class StatisticsCacheMetricsResponse(BaseModel):
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+class StatementCacheMetricsResponse(BaseModel):
+    size: int
+    hits: int
+    misses: int
+
+
+class HistogramSchema(BaseModel):
+    count: int
+    sum: float
+    avg: float
+    max: float
+    buckets: Dict[str, int]
+
+
+class SqlRouteMetricsSchema(BaseModel):
+    requests: int
+    statements: HistogramSchema
+    db_time_ms: HistogramSchema
+    rows: HistogramSchema
+    slowest_time_ms: float
+    slowest_statement: Optional[str]
+
+
+class SqlMetricsResponse(BaseModel):
+    slow_query_threshold: float
+    slow_statements: int
+    routes: Dict[str, SqlRouteMetricsSchema]
@@ -0,0 +1,8 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PaginationSchema(BaseModel):
+    limit: int = Field(100, gt=0, le=1000)
+    cursor: Optional[str] = Field(None)
@@ -1,7 +1,29 @@
-from datetime import datetime, date
-from typing import Optional
+from datetime import datetime, date, timedelta
+from enum import Enum
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
+
+
+class StatisticsBackend(str, Enum):
+    SQL = "sql"
+    SWEEP = "sweep"
+    ROLLUP = "rollup"
+
+
+class StatisticsGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class StatisticsJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
 
 
 class StatisticsPeriodSchema(BaseModel):
@@ -33,3 +55,71 @@ class StatisticsResponse(BaseModel):
     min_weight_total: Optional[float] = None
     max_weight_date: Optional[date] = None
     max_weight_total: Optional[float] = None
+
+
+class HistogramBucketSchema(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+
+class DistributionSchema(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+    histogram: List[HistogramBucketSchema] = []
+
+
+class StatisticsDistributionResponse(BaseModel):
+    coils_count: int
+    removed_coils_count: int
+    approximate: bool = False
+    sample_percent: Optional[float] = None
+    length: DistributionSchema
+    weight: DistributionSchema
+    storage_time: DistributionSchema
+
+
+class OccupancyPoint(TypedDict):
+    bucket: datetime
+    active_count: int
+    total_weight: float
+
+
+class OccupancyPointSchema(BaseModel):
+    bucket: datetime
+    active_count: int
+    total_weight: float
+
+
+class OccupancySeriesResponse(BaseModel):
+    granularity: StatisticsGranularity
+    items: List[OccupancyPointSchema]
+
+
+occupancy_point_adapter = TypeAdapter(OccupancyPoint)
+
+
+class StatisticsJobCreateSchema(BaseModel):
+    start_date: datetime = Field(
+        default_factory=lambda: datetime.now() - timedelta(days=30)
+    )
+    end_date: datetime = Field(default_factory=datetime.now)
+    backend: StatisticsBackend = Field(StatisticsBackend.SQL)
+
+
+class StatisticsJobSchema(BaseModel):
+    id: str
+    status: StatisticsJobStatus
+    start_date: datetime
+    end_date: datetime
+    backend: StatisticsBackend
+    chunks_total: int = 0
+    chunks_done: int = 0
+    chunks_reused: int = 0
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    result: Optional[StatisticsResponse] = None
+    detail: Optional[str] = None
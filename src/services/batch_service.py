@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, Dict
+
+from fastapi import HTTPException
+
+from src.config import settings
+from src.database import SessionDep, new_read_session, new_session
+from src.schemas.batch_schema import (
+    BatchQuerySpec,
+    BatchRequest,
+    FilteredQuerySpec,
+)
+from src.schemas.statistics_schema import StatisticsPeriodSchema
+from src.services.coil_service import CoilService
+from src.services.statistics_service import StatisticsService
+
+
+class BatchService:
+    def __init__(self):
+        self.coil_service = CoilService()
+        self.statistics_service = StatisticsService()
+
+    async def run(
+        self, data: BatchRequest, from_primary: bool = False
+    ) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(settings.batch_concurrency)
+        results = await asyncio.gather(
+            *(
+                self._run_query(spec, semaphore, from_primary)
+                for spec in data.queries
+            )
+        )
+        return {
+            "results": {
+                spec.name: result
+                for spec, result in zip(data.queries, results)
+            }
+        }
+
+    async def _run_query(
+        self,
+        spec: BatchQuerySpec,
+        semaphore: asyncio.Semaphore,
+        from_primary: bool,
+    ) -> Dict[str, Any]:
+        async with semaphore:
+            session = new_session() if from_primary else new_read_session()
+            async with session:
+                try:
+                    data = await self._execute(session, spec, from_primary)
+                except HTTPException as error:
+                    return {
+                        "type": spec.type,
+                        "status_code": error.status_code,
+                        "detail": error.detail,
+                    }
+        return {"type": spec.type, "status_code": 200, "data": data}
+
+    async def _execute(
+        self, session: SessionDep, spec: BatchQuerySpec, from_primary: bool
+    ) -> Any:
+        if isinstance(spec, FilteredQuerySpec):
+            return await self.coil_service.get_filtered(
+                session, spec.filters, spec.pagination
+            )
+
+        filter_params = StatisticsPeriodSchema(
+            start_date=spec.start_date, end_date=spec.end_date
+        )
+        return await self.statistics_service.get_statistics(
+            session, filter_params, spec.backend, from_primary
+        )
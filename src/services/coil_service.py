@@ -1,8 +1,32 @@
-from typing import List
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, List, Sequence, cast
 
-from src.schemas.coil_schema import CoilAddSchema, CoilSchema, CoilFilterSchema
+from sqlalchemy import Row
+
+from src.config import settings
+from src.schemas.coil_schema import (
+    CoilAddSchema,
+    CoilAsOfSummarySchema,
+    CoilCountSchema,
+    CoilBulkDeleteResponse,
+    CoilBulkDeleteSchema,
+    CoilExportFormat,
+    CoilFilterSchema,
+    CoilPage,
+    CoilRow,
+    CoilSchema,
+    coil_row_adapter,
+)
+from src.schemas.pagination_schema import PaginationSchema
 from src.repositories.coil_repository import CoilRepository
-from src.database import SessionDep
+from src.services.pagination import decode_cursor, encode_cursor
+from src.services.statistics_cache import statistics_cache
+from src.services.statistics_jobs import statistics_jobs
+from src.database import SessionDep, new_read_session
+
+EXPORT_COLUMNS = list(CoilRow.__annotations__)
 
 
 class CoilService:
@@ -14,25 +38,144 @@ class CoilService:
     ) -> CoilSchema:
         coil_dict = data.model_dump()
         coil = await self.repository.add(session, coil_dict)
+        await self._invalidate_statistics([coil])
         return CoilSchema.model_validate(coil, from_attributes=True)
 
-    async def delete(self, session: SessionDep, id: int) -> CoilSchema:
-        coil = await self.repository.delete(session, id)
-        return CoilSchema.model_validate(coil, from_attributes=True)
-
-    async def get_all(self, session: SessionDep) -> List[CoilSchema]:
-        coils = await self.repository.get_all(session)
+    async def create_many(
+        self, session: SessionDep, data: List[CoilAddSchema]
+    ) -> List[CoilSchema]:
+        coils = await self.repository.add_many(
+            session, [item.model_dump() for item in data]
+        )
+        await self._invalidate_statistics(coils)
         return [
             CoilSchema.model_validate(coil, from_attributes=True)
             for coil in coils
         ]
 
+    async def delete(self, session: SessionDep, id: int) -> CoilSchema:
+        coil = await self.repository.delete(session, id)
+        await self._invalidate_statistics([coil])
+        return CoilSchema.model_validate(coil, from_attributes=True)
+
+    async def delete_many(
+        self, session: SessionDep, data: CoilBulkDeleteSchema
+    ) -> CoilBulkDeleteResponse:
+        filter_dict = data.filters.model_dump() if data.filters else None
+        coils, already_deleted, not_found = await self.repository.delete_many(
+            session, data.ids, filter_dict
+        )
+        await self._invalidate_statistics(coils)
+        return CoilBulkDeleteResponse(
+            deleted=[
+                CoilSchema.model_validate(coil, from_attributes=True)
+                for coil in coils
+            ],
+            already_deleted=already_deleted,
+            not_found=not_found,
+        )
+
+    async def get_all(
+        self, session: SessionDep, pagination: PaginationSchema
+    ) -> CoilPage:
+        coils = await self.repository.get_all(
+            session, pagination.limit + 1, decode_cursor(pagination.cursor)
+        )
+        return self._build_page(coils, pagination.limit)
+
     async def get_filtered(
-        self, session: SessionDep, data: CoilFilterSchema
-    ) -> List[CoilSchema]:
+        self,
+        session: SessionDep,
+        data: CoilFilterSchema,
+        pagination: PaginationSchema,
+    ) -> CoilPage:
         filter_dict = data.model_dump()
-        coils = await self.repository.get_filtered(session, filter_dict)
-        return [
-            CoilSchema.model_validate(coil, from_attributes=True)
-            for coil in coils
-        ]
+        coils = await self.repository.get_filtered(
+            session,
+            filter_dict,
+            pagination.limit + 1,
+            decode_cursor(pagination.cursor),
+        )
+        return self._build_page(coils, pagination.limit)
+
+    async def count(
+        self,
+        session: SessionDep,
+        data: CoilFilterSchema,
+        approximate: bool = False,
+    ) -> CoilCountSchema:
+        filter_dict = data.model_dump(exclude_none=True)
+        if approximate and not filter_dict:
+            estimate = await self.repository.estimate_count(session)
+            if estimate is not None:
+                return CoilCountSchema(count=estimate, approximate=True)
+
+        totals = await self.repository.count_filtered(session, filter_dict)
+        return CoilCountSchema(**totals)
+
+    async def get_as_of(
+        self,
+        session: SessionDep,
+        moment: datetime,
+        pagination: PaginationSchema,
+    ) -> CoilPage:
+        coils = await self.repository.get_as_of(
+            session,
+            moment,
+            pagination.limit + 1,
+            decode_cursor(pagination.cursor),
+        )
+        return self._build_page(coils, pagination.limit)
+
+    async def get_as_of_summary(
+        self, session: SessionDep, moment: datetime
+    ) -> CoilAsOfSummarySchema:
+        summary = await self.repository.get_as_of_summary(session, moment)
+        return CoilAsOfSummarySchema(ts=moment, **summary)
+
+    async def export(
+        self, data: CoilFilterSchema, export_format: CoilExportFormat
+    ) -> AsyncIterator[bytes]:
+        if export_format == CoilExportFormat.CSV:
+            yield self._format_csv([EXPORT_COLUMNS])
+
+        filter_dict = data.model_dump()
+        async with new_read_session() as session:
+            async for rows in self.repository.stream_filtered(
+                session, filter_dict, settings.export_batch_size
+            ):
+                if export_format == CoilExportFormat.CSV:
+                    yield self._format_csv(rows)
+                else:
+                    yield self._format_ndjson(rows)
+
+    def _format_ndjson(self, rows: Sequence[Row]) -> bytes:
+        return b"".join(
+            coil_row_adapter.dump_json(cast(CoilRow, row._asdict())) + b"\n"
+            for row in rows
+        )
+
+    def _format_csv(self, rows: Sequence[Sequence]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            )
+        return buffer.getvalue().encode()
+
+    async def _invalidate_statistics(self, coils: Sequence[Row]) -> None:
+        if coils:
+            moment = min(coil.creation_date for coil in coils)
+            statistics_cache.invalidate(moment)
+            await statistics_jobs.invalidate(moment)
+
+    def _build_page(self, coils: List[Row], limit: int) -> CoilPage:
+        next_cursor = None
+        if len(coils) > limit:
+            next_cursor = encode_cursor(coils[limit - 1].id)
+        return {
+            "items": [cast(CoilRow, coil._asdict()) for coil in coils[:limit]],
+            "next_cursor": next_cursor,
+        }
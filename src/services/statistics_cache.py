@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from src.config import settings
+from src.schemas.statistics_schema import StatisticsResponse
+
+
+class StatisticsCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        resolution: float,
+        replica_lag: float,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.resolution = timedelta(seconds=resolution)
+        self.replica_lag = replica_lag
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._replica_stale_until = 0.0
+        self._entries: OrderedDict[
+            Hashable, Tuple[float, datetime, StatisticsResponse]
+        ] = OrderedDict()
+
+    def normalize(
+        self, start_date: datetime, end_date: datetime
+    ) -> Tuple[datetime, datetime]:
+        start_date = start_date.replace(tzinfo=None)
+        end_date = end_date.replace(tzinfo=None)
+        if not self.resolution:
+            return start_date, end_date
+
+        start_date -= (start_date - datetime.min) % self.resolution
+        remainder = (end_date - datetime.min) % self.resolution
+        if remainder:
+            end_date += self.resolution - remainder
+        return start_date, end_date
+
+    def get(self, key: Hashable) -> Optional[StatisticsResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < monotonic():
+            if entry is not None:
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def set(
+        self,
+        key: Hashable,
+        end_date: datetime,
+        value: StatisticsResponse,
+        version: int,
+        replica: bool = False,
+    ) -> None:
+        if self.max_size <= 0 or version != self.version:
+            return
+        if replica and self.replica_is_stale():
+            return
+
+        self._entries[key] = (monotonic() + self.ttl, end_date, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def replica_is_stale(self) -> bool:
+        return monotonic() < self._replica_stale_until
+
+    def invalidate(self, moment: datetime) -> None:
+        moment = moment.replace(tzinfo=None)
+        self.version += 1
+        self._replica_stale_until = monotonic() + self.replica_lag
+        for key, (_, end_date, _) in list(self._entries.items()):
+            if end_date >= moment:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self.version += 1
+        self._replica_stale_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+statistics_cache = StatisticsCache(
+    settings.statistics_cache_size,
+    settings.statistics_cache_ttl,
+    settings.statistics_cache_resolution,
+    settings.db_read_your_writes_seconds,
+)
@@ -0,0 +1,256 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import is_replica_session, new_read_session, new_session
+from src.repositories.coil_repository import CoilRepository
+from src.schemas.statistics_schema import (
+    StatisticsBackend,
+    StatisticsJobCreateSchema,
+    StatisticsJobSchema,
+    StatisticsJobStatus,
+    StatisticsResponse,
+)
+from src.services.statistics_cache import statistics_cache
+
+logger = logging.getLogger(__name__)
+
+DailyOccupancy = List[Tuple[date, int, float]]
+ChunkKey = Tuple[datetime, datetime, StatisticsBackend]
+
+
+class StatisticsJobStore(ABC):
+    @abstractmethod
+    async def save(self, job: StatisticsJobSchema) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[StatisticsJobSchema]:
+        pass
+
+    @abstractmethod
+    async def purge(self, finished_before: datetime) -> None:
+        pass
+
+    @abstractmethod
+    async def get_chunk(self, key: ChunkKey) -> Optional[DailyOccupancy]:
+        pass
+
+    @abstractmethod
+    async def save_chunk(self, key: ChunkKey, value: DailyOccupancy) -> None:
+        pass
+
+    @abstractmethod
+    async def invalidate_chunks(self, moment: datetime) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+
+class InMemoryStatisticsJobStore(StatisticsJobStore):
+    def __init__(self, max_chunks: int):
+        self.max_chunks = max_chunks
+        self._jobs: Dict[str, StatisticsJobSchema] = {}
+        self._chunks: OrderedDict[ChunkKey, DailyOccupancy] = OrderedDict()
+
+    async def save(self, job: StatisticsJobSchema) -> None:
+        self._jobs[job.id] = job.model_copy()
+
+    async def get(self, job_id: str) -> Optional[StatisticsJobSchema]:
+        return self._jobs.get(job_id)
+
+    async def purge(self, finished_before: datetime) -> None:
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at and job.finished_at < finished_before:
+                del self._jobs[job_id]
+
+    async def get_chunk(self, key: ChunkKey) -> Optional[DailyOccupancy]:
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+        return chunk
+
+    async def save_chunk(self, key: ChunkKey, value: DailyOccupancy) -> None:
+        if self.max_chunks <= 0:
+            return
+
+        self._chunks[key] = value
+        self._chunks.move_to_end(key)
+        while len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+
+    async def invalidate_chunks(self, moment: datetime) -> None:
+        moment = moment.replace(tzinfo=None)
+        for key in list(self._chunks):
+            if key[1] + timedelta(days=1) > moment:
+                del self._chunks[key]
+
+    async def clear(self) -> None:
+        self._jobs.clear()
+        self._chunks.clear()
+
+
+class StatisticsJobs:
+    def __init__(
+        self, store: StatisticsJobStore, concurrency: int, retention: float
+    ):
+        self.store = store
+        self.concurrency = concurrency
+        self.retention = timedelta(seconds=retention)
+        self.repository = CoilRepository()
+        self.cache = statistics_cache
+        self.version = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(
+        self, data: StatisticsJobCreateSchema, from_primary: bool = False
+    ) -> StatisticsJobSchema:
+        await self.store.purge(self._now() - self.retention)
+
+        start_date, end_date = self.cache.normalize(
+            data.start_date, data.end_date
+        )
+        job = StatisticsJobSchema(
+            id=uuid4().hex,
+            status=StatisticsJobStatus.PENDING,
+            start_date=start_date,
+            end_date=end_date,
+            backend=data.backend,
+            created_at=self._now(),
+        )
+        await self.store.save(job)
+
+        task = asyncio.create_task(self._run(job, from_primary))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get(self, job_id: str) -> StatisticsJobSchema:
+        await self.store.purge(self._now() - self.retention)
+
+        job = await self.store.get(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=404, detail="Statistics job is not found"
+            )
+        return job
+
+    async def invalidate(self, moment: datetime) -> None:
+        self.version += 1
+        await self.store.invalidate_chunks(moment)
+
+    async def clear(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        self._semaphore = None
+        self.version += 1
+        await self.store.clear()
+
+    async def _run(self, job: StatisticsJobSchema, from_primary: bool) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            job.status = StatisticsJobStatus.RUNNING
+            await self.store.save(job)
+            try:
+                job.result = await self._calculate(job, from_primary)
+            except Exception as error:
+                logger.exception("Statistics job %s failed", job.id)
+                job.status = StatisticsJobStatus.FAILED
+                job.detail = str(error)
+            else:
+                job.status = StatisticsJobStatus.COMPLETED
+            job.finished_at = self._now()
+            await self.store.save(job)
+
+    async def _calculate(
+        self, job: StatisticsJobSchema, from_primary: bool
+    ) -> StatisticsResponse:
+        key = (job.start_date, job.end_date, job.backend)
+        if not from_primary:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        version = self.cache.version
+        async with self._new_session(from_primary) as session:
+            replica = is_replica_session(session)
+            period_stats = await self.repository.get_period_statistics(
+                session, job.start_date, job.end_date
+            )
+
+        response = StatisticsResponse()
+        if period_stats["added_coils_count"]:
+            chunks = self.repository.split_period_by_month(
+                job.start_date, job.end_date
+            )
+            job.chunks_total = len(chunks)
+            await self.store.save(job)
+
+            daily_occupancy: DailyOccupancy = []
+            for chunk_start, chunk_end in chunks:
+                daily_occupancy += await self._get_chunk(
+                    job, chunk_start, chunk_end, from_primary
+                )
+                job.chunks_done += 1
+                await self.store.save(job)
+
+            response = StatisticsResponse(
+                **period_stats,
+                **self.repository.summarize_daily_occupancy(daily_occupancy),
+            )
+
+        if not from_primary:
+            self.cache.set(key, job.end_date, response, version, replica)
+        return response
+
+    async def _get_chunk(
+        self,
+        job: StatisticsJobSchema,
+        start_date: datetime,
+        end_date: datetime,
+        from_primary: bool,
+    ) -> DailyOccupancy:
+        key = (start_date, end_date, job.backend)
+        chunk = await self.store.get_chunk(key)
+        if chunk is not None:
+            job.chunks_reused += 1
+            return chunk
+
+        version = self.version
+        async with self._new_session(from_primary) as session:
+            replica = is_replica_session(session)
+            chunk = await self.repository.get_daily_occupancy(
+                session, start_date, end_date, job.backend
+            )
+        if version == self.version and not (
+            replica and self.cache.replica_is_stale()
+        ):
+            await self.store.save_chunk(key, chunk)
+        return chunk
+
+    def _new_session(self, from_primary: bool) -> AsyncSession:
+        return new_session() if from_primary else new_read_session()
+
+    def _now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+
+statistics_jobs = StatisticsJobs(
+    InMemoryStatisticsJobStore(settings.statistics_jobs_chunks),
+    settings.statistics_jobs_concurrency,
+    settings.statistics_jobs_retention,
+)
@@ -1,31 +1,150 @@
+from datetime import datetime
+from typing import AsyncIterator, Union
+
 from fastapi import HTTPException
 
-from src.database import SessionDep
+from src.config import settings
+from src.database import SessionDep, is_replica_session, new_read_session
 from src.schemas.statistics_schema import (
+    StatisticsBackend,
+    StatisticsDistributionResponse,
+    StatisticsGranularity,
+    StatisticsJobCreateSchema,
+    StatisticsJobSchema,
     StatisticsPeriodSchema,
     StatisticsResponse,
+    occupancy_point_adapter,
 )
 from src.repositories.coil_repository import CoilRepository
+from src.services.statistics_cache import statistics_cache
+from src.services.statistics_jobs import statistics_jobs
 
 
 class StatisticsService:
     def __init__(self):
         self.coil_repository = CoilRepository()
+        self.cache = statistics_cache
+        self.jobs = statistics_jobs
 
     async def get_statistics(
-        self, session: SessionDep, filter_params: StatisticsPeriodSchema
+        self,
+        session: SessionDep,
+        filter_params: StatisticsPeriodSchema,
+        backend: StatisticsBackend = StatisticsBackend.SQL,
+        from_primary: bool = False,
     ) -> StatisticsResponse:
-        if filter_params.start_date > filter_params.end_date:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid date range: start date is after end date",
+        self._check_period(filter_params)
+
+        start_date, end_date = self.cache.normalize(
+            filter_params.start_date, filter_params.end_date
+        )
+        if from_primary:
+            return await self._calculate_statistics(
+                session, start_date, end_date, backend
             )
 
-        statistics = await self.coil_repository.get_statistics(
-            session, filter_params.start_date, filter_params.end_date
+        key = (start_date, end_date, backend)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        version = self.cache.version
+        response = await self._calculate_statistics(
+            session, start_date, end_date, backend
+        )
+        self.cache.set(
+            key, end_date, response, version, is_replica_session(session)
+        )
+        return response
+
+    async def get_distribution(
+        self,
+        session: SessionDep,
+        filter_params: StatisticsPeriodSchema,
+        buckets: int,
+        approximate: bool = False,
+    ) -> StatisticsDistributionResponse:
+        self._check_period(filter_params)
+
+        sample_percent = (
+            settings.statistics_sample_percent if approximate else None
+        )
+        distribution = await self.coil_repository.get_distribution(
+            session,
+            filter_params.start_date,
+            filter_params.end_date,
+            buckets,
+            sample_percent,
         )
+        return StatisticsDistributionResponse(
+            **distribution,
+            approximate=approximate,
+            sample_percent=sample_percent,
+        )
+
+    def get_occupancy_series(
+        self,
+        filter_params: StatisticsPeriodSchema,
+        granularity: StatisticsGranularity,
+    ) -> AsyncIterator[bytes]:
+        self._check_period(filter_params)
+        return self._stream_occupancy_series(filter_params, granularity)
 
+    async def _stream_occupancy_series(
+        self,
+        filter_params: StatisticsPeriodSchema,
+        granularity: StatisticsGranularity,
+    ) -> AsyncIterator[bytes]:
+        yield b'{"granularity":"' + granularity.value.encode() + b'","items":['
+
+        separator = b""
+        async with new_read_session() as session:
+            async for rows in self.coil_repository.stream_occupancy_series(
+                session,
+                filter_params.start_date,
+                filter_params.end_date,
+                granularity,
+                settings.export_batch_size,
+            ):
+                yield separator + b",".join(
+                    occupancy_point_adapter.dump_json(row._asdict())
+                    for row in rows
+                )
+                separator = b","
+
+        yield b"]}"
+
+    async def create_job(
+        self, data: StatisticsJobCreateSchema, from_primary: bool = False
+    ) -> StatisticsJobSchema:
+        self._check_period(data)
+        return await self.jobs.submit(data, from_primary)
+
+    async def get_job(self, job_id: str) -> StatisticsJobSchema:
+        return await self.jobs.get(job_id)
+
+    async def _calculate_statistics(
+        self,
+        session: SessionDep,
+        start_date: datetime,
+        end_date: datetime,
+        backend: StatisticsBackend,
+    ) -> StatisticsResponse:
+        statistics = await self.coil_repository.get_statistics(
+            session, start_date, end_date, backend
+        )
         if statistics is None:
             return StatisticsResponse()
-
         return StatisticsResponse(**statistics)
+
+    def _check_period(
+        self,
+        filter_params: Union[
+            StatisticsPeriodSchema, StatisticsJobCreateSchema
+        ],
+    ) -> None:
+        if filter_params.start_date > filter_params.end_date:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid date range: start date is after end date",
+            )
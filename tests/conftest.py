@@ -1,16 +1,22 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock
 
 import pytest
 import pytest_asyncio
+from fastapi import status
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import Base, engine
+from src.database import Base, dispose_engines, get_engine
+from src.instrumentation import sql_metrics
 from src.main import app as main_app
 from src.models.coil_model import CoilModel
 from src.repositories.coil_repository import CoilRepository
+from src.repositories.statement_cache import statement_cache
 from src.services.coil_service import CoilService
+from src.services.statistics_cache import statistics_cache
+from src.services.statistics_jobs import statistics_jobs
 from src.services.statistics_service import StatisticsService
 
 
@@ -96,20 +102,35 @@ def sample_statistics_data():
 
 
 async def create_tables():
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
 async def drop_tables():
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+async def wait_for_job(client, job_id: str) -> dict:
+    for _ in range(200):
+        response = await client.get(f"/api/statistics/jobs/{job_id}")
+        assert response.status_code == status.HTTP_200_OK
+        if response.json()["status"] in ("completed", "failed"):
+            return response.json()
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Statistics job {job_id} did not finish")
+
+
 @pytest_asyncio.fixture()
 async def client():
     await drop_tables()
     await create_tables()
+    statistics_cache.clear()
+    sql_metrics.clear()
+    statement_cache.clear()
+    await statistics_jobs.clear()
     async with AsyncClient(
         transport=ASGITransport(main_app), base_url="http://test"
     ) as test_client:
         yield test_client
+    await dispose_engines()
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+
+from src.config import settings
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_named_queries(client, monkeypatch):
+    monkeypatch.setattr(settings, "batch_concurrency", 2)
+    for length in (100.0, 150.0, 200.0):
+        await client.post(
+            "/api/coils/", json={"length": length, "weight": 500.0}
+        )
+
+    response = await client.post(
+        "/api/batch/",
+        json={
+            "queries": [
+                {
+                    "type": "filtered",
+                    "name": "long",
+                    "filters": {"length_min": 120},
+                    "pagination": {"limit": 1},
+                },
+                {"type": "filtered", "name": "all"},
+                {"type": "statistics", "name": "month"},
+            ]
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert list(results) == ["long", "all", "month"]
+    assert results["long"]["status_code"] == status.HTTP_200_OK
+    assert [coil["length"] for coil in results["long"]["data"]["items"]] == [
+        150.0
+    ]
+    assert results["long"]["data"]["next_cursor"] is not None
+    assert len(results["all"]["data"]["items"]) == 3
+    assert results["month"]["type"] == "statistics"
+    assert results["month"]["data"]["added_coils_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_errors_per_query(client):
+    now = datetime.now()
+
+    response = await client.post(
+        "/api/batch/",
+        json={
+            "queries": [
+                {
+                    "type": "statistics",
+                    "name": "reversed",
+                    "start_date": now.isoformat(),
+                    "end_date": (now - timedelta(days=1)).isoformat(),
+                },
+                {"type": "filtered", "name": "all"},
+            ]
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert results["reversed"]["status_code"] == status.HTTP_400_BAD_REQUEST
+    assert results["reversed"]["data"] is None
+    assert "Invalid date range" in results["reversed"]["detail"]
+    assert results["all"]["data"]["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_requires_unique_names(client):
+    response = await client.post(
+        "/api/batch/",
+        json={
+            "queries": [
+                {"type": "filtered", "name": "same"},
+                {"type": "statistics", "name": "same"},
+            ]
+        },
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
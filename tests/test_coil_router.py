@@ -1,5 +1,14 @@
+import json
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from fastapi import status
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from src.config import settings
+from src.database import new_session
+from src.models.coil_model import CoilModel
 
 
 @pytest.mark.asyncio
@@ -20,16 +29,16 @@ async def test_coil_router_add_delete(client, sample_coil_data):
 
     response_get_coils = await client.get("/api/coils/")
     assert response_get_coils.status_code == status.HTTP_200_OK
-    assert len(response_get_coils.json()) == 1
-    assert response_get_coils.json()[0]["id"] == coil_id
-    assert response_get_coils.json()[0]["deletion_date"] is not None
+    assert len(response_get_coils.json()["items"]) == 1
+    assert response_get_coils.json()["items"][0]["id"] == coil_id
+    assert response_get_coils.json()["items"][0]["deletion_date"] is not None
 
 
 @pytest.mark.asyncio
 async def test_coil_router_api_add(client, sample_coil_data):
     response_get_coils = await client.get("/api/coils/")
     assert response_get_coils.status_code == status.HTTP_200_OK
-    assert len(response_get_coils.json()) == 0
+    assert len(response_get_coils.json()["items"]) == 0
 
     response_coil = await client.post("/api/coils/", json=sample_coil_data)
     coil_id = response_coil.json()["id"]
@@ -40,8 +49,8 @@ async def test_coil_router_api_add(client, sample_coil_data):
 
     response_get_coils = await client.get("/api/coils/")
     assert response_get_coils.status_code == status.HTTP_200_OK
-    assert len(response_get_coils.json()) == 1
-    assert response_get_coils.json()[0]["id"] == coil_id
+    assert len(response_get_coils.json()["items"]) == 1
+    assert response_get_coils.json()["items"][0]["id"] == coil_id
 
 
 @pytest.mark.asyncio
@@ -58,9 +67,9 @@ async def test_coil_router_api_get_filtered(client):
         "/api/coils/filtered", params=filter_params
     )
     assert response_filtered_coils.status_code == status.HTTP_200_OK
-    assert len(response_filtered_coils.json()) == 2
-    assert response_filtered_coils.json()[0]["length"] == 100.0
-    assert response_filtered_coils.json()[1]["length"] == 150.0
+    assert len(response_filtered_coils.json()["items"]) == 2
+    assert response_filtered_coils.json()["items"][0]["length"] == 100.0
+    assert response_filtered_coils.json()["items"][1]["length"] == 150.0
 
 
 @pytest.mark.asyncio
@@ -74,3 +83,357 @@ async def test_add_coil_invalid_data(client):
         response_add_coil_invalid_data.status_code
         == status.HTTP_422_UNPROCESSABLE_ENTITY
     )
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_get_paginated(client, sample_coil_data):
+    for _ in range(5):
+        await client.post("/api/coils/", json=sample_coil_data)
+
+    response_page_1 = await client.get("/api/coils/", params={"limit": 2})
+    assert response_page_1.status_code == status.HTTP_200_OK
+    assert [coil["id"] for coil in response_page_1.json()["items"]] == [1, 2]
+    assert response_page_1.json()["next_cursor"] is not None
+
+    response_page_2 = await client.get(
+        "/api/coils/",
+        params={"limit": 2, "cursor": response_page_1.json()["next_cursor"]},
+    )
+    assert [coil["id"] for coil in response_page_2.json()["items"]] == [3, 4]
+
+    response_page_3 = await client.get(
+        "/api/coils/",
+        params={"limit": 2, "cursor": response_page_2.json()["next_cursor"]},
+    )
+    assert [coil["id"] for coil in response_page_3.json()["items"]] == [5]
+    assert response_page_3.json()["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_get_filtered_paginated(client):
+    for length in (10.0, 60.0, 20.0, 70.0, 80.0):
+        await client.post(
+            "/api/coils/", json={"length": length, "weight": 500.0}
+        )
+
+    filter_params = {"length_min": 50.0, "limit": 2}
+    response_page_1 = await client.get(
+        "/api/coils/filtered", params=filter_params
+    )
+    assert [coil["id"] for coil in response_page_1.json()["items"]] == [2, 4]
+
+    response_page_2 = await client.get(
+        "/api/coils/filtered",
+        params={
+            **filter_params,
+            "cursor": response_page_1.json()["next_cursor"],
+        },
+    )
+    assert [coil["id"] for coil in response_page_2.json()["items"]] == [5]
+    assert response_page_2.json()["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_get_invalid_cursor(client):
+    response = await client.get("/api/coils/", params={"cursor": "invalid"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_export(client):
+    for length in (10.0, 60.0, 70.0):
+        await client.post(
+            "/api/coils/", json={"length": length, "weight": 500.0}
+        )
+
+    response_ndjson = await client.get(
+        "/api/coils/export", params={"length_min": 50.0}
+    )
+    assert response_ndjson.status_code == status.HTTP_200_OK
+    assert response_ndjson.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response_ndjson.text.splitlines()]
+    assert [row["length"] for row in rows] == [60.0, 70.0]
+    assert rows[0]["deletion_date"] is None
+
+    response_csv = await client.get(
+        "/api/coils/export", params={"length_min": 50.0, "format": "csv"}
+    )
+    assert response_csv.status_code == status.HTTP_200_OK
+    lines = response_csv.text.splitlines()
+    assert lines[0] == "id,length,weight,creation_date,deletion_date"
+    assert len(lines) == 3
+    assert lines[1].startswith("2,60.0,500.0,")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("copy_threshold", [1000, 1])
+async def test_coil_router_api_add_bulk(client, monkeypatch, copy_threshold):
+    monkeypatch.setattr(settings, "bulk_copy_threshold", copy_threshold)
+    coils_data = [
+        {"length": 100.0, "weight": 500.0},
+        {"length": 150.0, "weight": 750.0},
+        {"length": 49.0, "weight": 1000.0},
+    ]
+
+    response = await client.post("/api/coils/bulk", json=coils_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [coil["id"] for coil in response.json()] == [1, 2, 3]
+    assert [coil["length"] for coil in response.json()] == [100.0, 150.0, 49.0]
+    assert all(coil["creation_date"] for coil in response.json())
+
+    response_statistics = await client.get("/api/statistics/")
+    assert response_statistics.json()["added_coils_count"] == 3
+    assert response_statistics.json()["total_weight"] == 2250.0
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_add_bulk_is_atomic(client):
+    coils_data = [
+        {"length": 100.0, "weight": 500.0},
+        {"length": -10.0, "weight": 500.0},
+    ]
+
+    response = await client.post("/api/coils/bulk", json=coils_data)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response_get_coils = await client.get("/api/coils/")
+    assert len(response_get_coils.json()["items"]) == 0
+
+    response_empty = await client.post("/api/coils/bulk", json=[])
+    assert response_empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("copy_threshold", [1000, 1])
+async def test_coil_router_api_add_bulk_rolls_back_database_errors(
+    client, monkeypatch, copy_threshold
+):
+    monkeypatch.setattr(settings, "bulk_copy_threshold", copy_threshold)
+    async with new_session() as session:
+        await session.execute(
+            text(
+                "ALTER TABLE coils "
+                "ADD CONSTRAINT coils_length_limit CHECK (length < 1000)"
+            )
+        )
+        await session.commit()
+    coils_data = [
+        {"length": 100.0, "weight": 500.0},
+        {"length": 5000.0, "weight": 500.0},
+    ]
+
+    with pytest.raises(IntegrityError):
+        await client.post("/api/coils/bulk", json=coils_data)
+
+    async with new_session() as session:
+        coils_count = await session.scalar(text("SELECT count(*) FROM coils"))
+        statistics_count = await session.scalar(
+            text("SELECT count(*) FROM coil_daily_statistics")
+        )
+    assert coils_count == 0
+    assert statistics_count == 0
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_delete_twice(client, sample_coil_data):
+    response_coil = await client.post("/api/coils/", json=sample_coil_data)
+    coil_id = response_coil.json()["id"]
+
+    response_delete = await client.delete(f"/api/coils/{coil_id}")
+    assert response_delete.status_code == status.HTTP_200_OK
+
+    response_delete_again = await client.delete(f"/api/coils/{coil_id}")
+    assert response_delete_again.status_code == status.HTTP_400_BAD_REQUEST
+
+    response_delete_missing = await client.delete("/api/coils/100")
+    assert response_delete_missing.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_delete_bulk_by_ids(client, sample_coil_data):
+    for _ in range(3):
+        await client.post("/api/coils/", json=sample_coil_data)
+    await client.delete("/api/coils/1")
+
+    response = await client.post(
+        "/api/coils/bulk/delete", json={"ids": [1, 2, 3, 100]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [coil["id"] for coil in response.json()["deleted"]] == [2, 3]
+    assert all(coil["deletion_date"] for coil in response.json()["deleted"])
+    assert response.json()["already_deleted"] == [1]
+    assert response.json()["not_found"] == [100]
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_delete_bulk_by_filters(client):
+    for length in (10.0, 60.0, 70.0):
+        await client.post(
+            "/api/coils/", json={"length": length, "weight": 500.0}
+        )
+
+    response = await client.post(
+        "/api/coils/bulk/delete", json={"filters": {"length_min": 50.0}}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [coil["id"] for coil in response.json()["deleted"]] == [2, 3]
+
+    response_statistics = await client.get("/api/statistics/")
+    assert response_statistics.json()["removed_coils_count"] == 2
+
+    response_no_filters = await client.post(
+        "/api/coils/bulk/delete", json={"filters": {}}
+    )
+    assert (
+        response_no_filters.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    )
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_get_as_of(client):
+    moment = datetime(2024, 6, 1, 12, 0)
+    coils = [
+        (moment - timedelta(days=10), moment - timedelta(days=5)),
+        (moment - timedelta(days=10), moment),
+        (moment - timedelta(days=10), moment + timedelta(seconds=1)),
+        (moment - timedelta(days=3), None),
+        (moment, None),
+        (moment + timedelta(seconds=1), None),
+    ]
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=10.0 * (index + 1),
+                    weight=100.0 * (index + 1),
+                    creation_date=created,
+                    deletion_date=(
+                        deleted.replace(tzinfo=timezone.utc)
+                        if deleted
+                        else None
+                    ),
+                )
+                for index, (created, deleted) in enumerate(coils)
+            ]
+        )
+        await session.commit()
+
+    response = await client.get(
+        "/api/coils/as-of", params={"ts": moment.isoformat(), "limit": 2}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    first_page = response.json()
+    assert [coil["weight"] for coil in first_page["items"]] == [300.0, 400.0]
+
+    response_next = await client.get(
+        "/api/coils/as-of",
+        params={
+            "ts": moment.isoformat(),
+            "limit": 2,
+            "cursor": first_page["next_cursor"],
+        },
+    )
+    assert [coil["weight"] for coil in response_next.json()["items"]] == [
+        500.0
+    ]
+    assert response_next.json()["next_cursor"] is None
+
+    response_summary = await client.get(
+        "/api/coils/as-of",
+        params={"ts": moment.isoformat(), "summary": True},
+    )
+    assert response_summary.status_code == status.HTTP_200_OK
+    assert response_summary.json()["count"] == 3
+    assert response_summary.json()["total_weight"] == 1200.0
+    assert response_summary.json()["total_length"] == 120.0
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_get_as_of_with_offset(client):
+    moment = datetime(2024, 6, 1, 12, 0)
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=10.0,
+                    weight=100.0,
+                    creation_date=moment - timedelta(hours=1),
+                ),
+                CoilModel(
+                    length=20.0,
+                    weight=200.0,
+                    creation_date=moment + timedelta(hours=1),
+                ),
+            ]
+        )
+        await session.commit()
+
+    response = await client.get(
+        "/api/coils/as-of",
+        params={"ts": "2024-06-01T15:00:00+03:00", "summary": True},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["count"] == 1
+    assert response.json()["total_weight"] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_get_as_of_requires_ts(client):
+    response = await client.get("/api/coils/as-of")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_count(client):
+    for length, weight in ((10.0, 100.0), (20.0, 200.0), (30.0, 300.0)):
+        await client.post(
+            "/api/coils/", json={"length": length, "weight": weight}
+        )
+
+    response = await client.get("/api/coils/count")
+    response_filtered = await client.get(
+        "/api/coils/count", params={"length_min": 15}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "count": 3,
+        "total_weight": 600.0,
+        "total_length": 60.0,
+        "approximate": False,
+    }
+    assert response_filtered.json()["count"] == 2
+    assert response_filtered.json()["total_weight"] == 500.0
+
+
+@pytest.mark.asyncio
+async def test_coil_router_api_count_approximate(client, sample_coil_data):
+    for _ in range(3):
+        await client.post("/api/coils/", json=sample_coil_data)
+
+    response_unanalyzed = await client.get(
+        "/api/coils/count", params={"approximate": True}
+    )
+    assert response_unanalyzed.json()["approximate"] is False
+    assert response_unanalyzed.json()["count"] == 3
+
+    async with new_session() as session:
+        await session.execute(text("ANALYZE coils"))
+
+    response = await client.get(
+        "/api/coils/count", params={"approximate": True}
+    )
+    response_filtered = await client.get(
+        "/api/coils/count", params={"approximate": True, "weight_min": 1}
+    )
+
+    assert response.json() == {
+        "count": 3,
+        "total_weight": None,
+        "total_length": None,
+        "approximate": True,
+    }
+    assert response_filtered.json()["approximate"] is False
+    assert response_filtered.json()["count"] == 3
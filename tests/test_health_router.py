@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy import text
+
+from src.config import settings
+import src.database as database
+from src.database import build_engine, get_engine
+from src.lifespan import lifespan
+from src.main import app as main_app
+from src.repositories.statement_cache import statement_cache
+from tests.conftest import drop_tables
+
+
+async def wait_until_ready(client) -> int:
+    for _ in range(100):
+        response = await client.get("/api/health/ready")
+        if response.status_code == status.HTTP_200_OK:
+            break
+        await asyncio.sleep(0.02)
+    return response.status_code
+
+
+async def table_exists(name: str) -> bool:
+    async with get_engine().connect() as connection:
+        return bool(
+            await connection.scalar(
+                text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_ready_after_warm_up(client):
+    response_live = await client.get("/api/health/live")
+    response_cold = await client.get("/api/health/ready")
+
+    assert response_live.status_code == status.HTTP_200_OK
+    assert response_cold.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    async with lifespan(main_app):
+        assert await wait_until_ready(client) == status.HTTP_200_OK
+        assert statement_cache.snapshot()["misses"] == 2
+        assert statement_cache.snapshot()["hits"] == (
+            settings.db_pool_size * 2 - 2
+        )
+
+    response_stopped = await client.get("/api/health/ready")
+    assert response_stopped.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_schema_created_only_on_request(client, monkeypatch):
+    monkeypatch.setattr(settings, "db_warmup_retry_interval", 0.01)
+    await drop_tables()
+
+    async with lifespan(main_app):
+        assert not await table_exists("coils")
+        await asyncio.sleep(0.05)
+        response = await client.get("/api/health/ready")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    monkeypatch.setattr(settings, "db_create_schema", True)
+    async with lifespan(main_app):
+        assert await table_exists("coils")
+        assert await wait_until_ready(client) == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_ready_checks_primary_without_warm_up(client, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_warmup", False)
+    monkeypatch.setattr(settings, "db_warmup_retry_interval", 0.01)
+    unreachable = settings.database_url.replace(
+        f":{settings.postgres_port}/", ":1/"
+    )
+    unreachable_engine = build_engine(unreachable)
+    monkeypatch.setattr(database, "_engine", unreachable_engine)
+    monkeypatch.setattr(database, "_sessions", None)
+
+    try:
+        async with lifespan(main_app):
+            await asyncio.sleep(0.05)
+            response = await client.get("/api/health/ready")
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+            monkeypatch.setattr(database, "_engine", None)
+            assert await wait_until_ready(client) == status.HTTP_200_OK
+    finally:
+        await unreachable_engine.dispose()
@@ -0,0 +1,132 @@
+import logging
+
+import pytest
+from fastapi import status
+
+from src.config import settings
+from src.database import get_engine
+
+
+@pytest.mark.asyncio
+async def test_get_pool_metrics(client, sample_coil_data):
+    await client.post("/api/coils/", json=sample_coil_data)
+
+    response = await client.get("/api/metrics/pool")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["acquisitions"] >= 1
+    assert response.json()["checked_out"] == 0
+    assert response.json()["idle"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_count_read_acquisitions(client):
+    response_before = await client.get("/api/metrics/pool")
+    await client.get("/api/coils/")
+    response_after = await client.get("/api/metrics/pool")
+
+    assert (
+        response_after.json()["acquisitions"]
+        == response_before.json()["acquisitions"] + 1
+    )
+    engines = response_after.json()["engines"]
+    assert list(engines) == [get_engine().url.render_as_string()]
+
+
+@pytest.mark.asyncio
+async def test_statistics_cache_invalidated_by_writes(
+    client, sample_coil_data
+):
+    await client.post("/api/coils/", json=sample_coil_data)
+
+    response_miss = await client.get("/api/statistics/")
+    response_hit = await client.get("/api/statistics/")
+    assert response_hit.json() == response_miss.json()
+
+    response_metrics = await client.get("/api/metrics/statistics-cache")
+    assert response_metrics.status_code == status.HTTP_200_OK
+    assert response_metrics.json()["hits"] == 1
+    assert response_metrics.json()["misses"] == 1
+    assert response_metrics.json()["size"] == 1
+
+    await client.post("/api/coils/", json=sample_coil_data)
+
+    response_after_write = await client.get("/api/statistics/")
+    assert response_after_write.json()["added_coils_count"] == 2
+
+    response_metrics = await client.get("/api/metrics/statistics-cache")
+    assert response_metrics.json()["invalidations"] == 1
+    assert response_metrics.json()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(client, sample_coil_data):
+    response = await client.post("/api/coils/", json=sample_coil_data)
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="2 statements"' in timing
+    assert 'db-rows;desc="2"' in timing
+    assert "app;dur=" in timing
+
+
+@pytest.mark.asyncio
+async def test_get_sql_metrics(client, sample_coil_data):
+    for _ in range(3):
+        await client.post("/api/coils/", json=sample_coil_data)
+    await client.get("/api/coils/filtered", params={"length_min": 1})
+
+    response = await client.get("/api/metrics/sql")
+
+    assert response.status_code == status.HTTP_200_OK
+    routes = response.json()["routes"]
+    create_metrics = routes["POST /api/coils/"]
+    assert create_metrics["requests"] == 3
+    assert create_metrics["statements"]["sum"] == 6
+    assert create_metrics["statements"]["buckets"]["2"] == 3
+    assert create_metrics["slowest_statement"]
+    filtered_metrics = routes["GET /api/coils/filtered"]
+    assert filtered_metrics["statements"]["sum"] == 1
+    assert filtered_metrics["rows"]["sum"] == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged(
+    client, sample_coil_data, monkeypatch, caplog
+):
+    monkeypatch.setattr(settings, "db_slow_query_threshold", 1e-9)
+
+    with caplog.at_level(logging.WARNING, logger="src.instrumentation"):
+        await client.post("/api/coils/", json=sample_coil_data)
+
+    assert any("Slow query" in record.message for record in caplog.records)
+    response = await client.get("/api/metrics/sql")
+    assert response.json()["slow_statements"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_reuses_filter_shapes(client, sample_coil_data):
+    for _ in range(3):
+        await client.post("/api/coils/", json=sample_coil_data)
+
+    responses = [
+        await client.get("/api/coils/filtered", params=params)
+        for params in (
+            {"length_min": 1, "limit": 2},
+            {"length_min": 50, "limit": 2},
+            {"weight_max": 1000, "limit": 2},
+        )
+    ]
+    response_next = await client.get(
+        "/api/coils/filtered",
+        params={
+            "length_min": 1,
+            "limit": 2,
+            "cursor": responses[0].json()["next_cursor"],
+        },
+    )
+
+    assert [len(r.json()["items"]) for r in responses] == [2, 2, 2]
+    assert len(response_next.json()["items"]) == 1
+    response = await client.get("/api/metrics/statement-cache")
+    assert response.json() == {"size": 3, "hits": 1, "misses": 3}
@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+from sqlalchemy import inspect, select, text
+
+from src.config import settings
+from src.database import get_engine, new_session
+from src.models.coil_model import CoilModel
+from src.partitions import (
+    archive_partitions,
+    ensure_partitions,
+    list_partitions,
+    partition_name,
+    period_start,
+)
+from src.repositories.coil_repository import CoilRepository
+from tests.conftest import create_tables, drop_tables
+
+TABLE = CoilModel.__tablename__
+
+
+@pytest_asyncio.fixture
+async def partitioned_client(client, monkeypatch):
+    monkeypatch.setattr(settings, "coils_partition_interval", "month")
+    monkeypatch.setattr(settings, "coils_partitions_ahead", 2)
+    await drop_tables()
+    await create_tables()
+    yield client
+    await drop_tables()
+
+
+def now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.mark.asyncio
+async def test_create_all_creates_partitions(partitioned_client):
+    async with get_engine().connect() as connection:
+        partitions = await connection.run_sync(list_partitions, TABLE)
+
+    current = period_start(now(), "month")
+    assert [name for name, _, _ in partitions] == sorted(
+        [f"{TABLE}_default"]
+        + [
+            partition_name(TABLE, start)
+            for start in (
+                current,
+                period_start(current + timedelta(days=32), "month"),
+                period_start(current + timedelta(days=63), "month"),
+            )
+        ]
+    )
+
+    response = await partitioned_client.post(
+        "/api/coils/", json={"length": 100.0, "weight": 500.0}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    response_delete = await partitioned_client.delete(
+        f"/api/coils/{response.json()['id']}"
+    )
+    assert response_delete.status_code == status.HTTP_200_OK
+
+
+async def primary_key_columns() -> list:
+    async with get_engine().connect() as connection:
+        constraint = await connection.run_sync(
+            lambda sync_connection: inspect(sync_connection).get_pk_constraint(
+                TABLE
+            )
+        )
+    return constraint["constrained_columns"]
+
+
+@pytest.mark.asyncio
+async def test_primary_key_is_id_without_partitioning(client):
+    assert await primary_key_columns() == ["id"]
+
+
+@pytest.mark.asyncio
+async def test_primary_key_includes_partition_key(partitioned_client):
+    assert await primary_key_columns() == ["id", "creation_date"]
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_rows_out_of_default(
+    partitioned_client,
+):
+    old_creation = now() - timedelta(days=800)
+    async with new_session() as session:
+        session.add(
+            CoilModel(
+                length=100.0,
+                weight=500.0,
+                creation_date=old_creation,
+                deletion_date=(old_creation + timedelta(days=10)).replace(
+                    tzinfo=timezone.utc
+                ),
+            )
+        )
+        await session.commit()
+
+    async with get_engine().begin() as connection:
+        created = await connection.run_sync(ensure_partitions, TABLE)
+        default_rows = await connection.scalar(
+            text(f"SELECT count(*) FROM {TABLE}_default")
+        )
+
+    old_partition = partition_name(TABLE, period_start(old_creation, "month"))
+    assert created == [old_partition]
+    assert default_rows == 0
+
+    response = await partitioned_client.get("/api/coils/")
+    assert len(response.json()["items"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_period_filters_prune_partitions(partitioned_client):
+    start = period_start(now(), "month")
+    query = CoilRepository()._apply_filters(
+        select(*CoilModel.__table__.c),
+        {
+            "creation_date_min": start + timedelta(days=1),
+            "creation_date_max": start + timedelta(days=2),
+        },
+    )
+    compiled = query.compile(
+        dialect=get_engine().dialect, compile_kwargs={"literal_binds": True}
+    )
+
+    async with get_engine().connect() as connection:
+        lines = (
+            await connection.execute(text(f"EXPLAIN {compiled}"))
+        ).scalars()
+        plan = "\n".join(lines)
+
+    assert partition_name(TABLE, start) in plan
+    assert f"{TABLE}_default" not in plan
+    assert partition_name(TABLE, start + timedelta(days=32)) not in plan
+
+
+@pytest.mark.asyncio
+async def test_archive_partitions_detaches_fully_deleted(partitioned_client):
+    deleted_creation = now() - timedelta(days=800)
+    stored_creation = now() - timedelta(days=500)
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=100.0,
+                    weight=500.0,
+                    creation_date=deleted_creation,
+                    deletion_date=(
+                        deleted_creation + timedelta(days=10)
+                    ).replace(tzinfo=timezone.utc),
+                ),
+                CoilModel(
+                    length=150.0,
+                    weight=750.0,
+                    creation_date=stored_creation,
+                ),
+            ]
+        )
+        await session.commit()
+
+    async with get_engine().begin() as connection:
+        await connection.run_sync(ensure_partitions, TABLE)
+        archived = await connection.run_sync(
+            archive_partitions, TABLE, timedelta(days=365)
+        )
+
+    deleted_partition = partition_name(
+        TABLE, period_start(deleted_creation, "month")
+    )
+    assert archived == [f"{deleted_partition}_archive"]
+
+    response = await partitioned_client.get("/api/coils/")
+    assert [coil["weight"] for coil in response.json()["items"]] == [750.0]
+
+    async with get_engine().begin() as connection:
+        await connection.execute(text(f"DROP TABLE {archived[0]}"))
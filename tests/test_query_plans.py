@@ -0,0 +1,138 @@
+import json
+from datetime import datetime, timedelta
+from itertools import combinations
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+
+from src.database import dispose_engines, get_engine, new_session
+from src.repositories.coil_repository import CoilRepository
+from tests.conftest import create_tables, drop_tables
+
+SEED_COILS = 50000
+SEED_END = datetime(2025, 1, 1)
+
+FILTER_GROUPS = {
+    "id": {"id_min": 20000, "id_max": 20100},
+    "length": {"length_min": 10.0, "length_max": 10.5},
+    "weight": {"weight_min": 500.0, "weight_max": 502.5},
+    "creation_date": {
+        "creation_date_min": SEED_END - timedelta(days=400),
+        "creation_date_max": SEED_END - timedelta(days=396),
+    },
+    "deletion_date": {
+        "deletion_date_min": SEED_END - timedelta(days=200),
+        "deletion_date_max": SEED_END - timedelta(days=196),
+    },
+}
+FILTER_COMBINATIONS = [
+    combination
+    for size in range(1, len(FILTER_GROUPS) + 1)
+    for combination in combinations(FILTER_GROUPS, size)
+]
+
+repository = CoilRepository()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def seeded_coils():
+    await drop_tables()
+    await create_tables()
+    async with new_session() as session:
+        await session.execute(
+            text(
+                "INSERT INTO coils "
+                "(length, weight, creation_date, deletion_date) "
+                "SELECT "
+                "1 + random() * 99, "
+                "100 + random() * 900, "
+                "created, "
+                "CASE WHEN random() < 0.95 "
+                "THEN (created + random() * interval '60 days') "
+                "AT TIME ZONE 'UTC' END "
+                "FROM ("
+                "SELECT CAST(:end AS timestamp) "
+                "- (:count - n) * interval '30 minutes' "
+                "AS created "
+                "FROM generate_series(1, :count) AS n"
+                ") AS seed"
+            ),
+            {"end": SEED_END, "count": SEED_COILS},
+        )
+        await session.commit()
+        await session.execute(text("ANALYZE coils"))
+    yield
+    await dispose_engines()
+
+
+async def explain(query) -> dict:
+    compiled = query.compile(
+        dialect=get_engine().dialect, compile_kwargs={"literal_binds": True}
+    )
+    async with new_session() as session:
+        result = await session.execute(
+            text(f"EXPLAIN (FORMAT JSON) {compiled}")
+        )
+        plan: list = result.scalar_one()
+    return plan[0]["Plan"]
+
+
+def seq_scans(plan: dict) -> list:
+    scans = []
+    if plan["Node Type"] == "Seq Scan" and plan["Relation Name"] == "coils":
+        scans.append(plan.get("Filter"))
+    for child in plan.get("Plans", []):
+        scans.extend(seq_scans(child))
+    return scans
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize(
+    "groups",
+    FILTER_COMBINATIONS,
+    ids=["+".join(c) for c in FILTER_COMBINATIONS],
+)
+async def test_filtered_query_uses_indexes(seeded_coils, groups):
+    data = {
+        key: value
+        for group in groups
+        for key, value in FILTER_GROUPS[group].items()
+    }
+    query = repository._apply_filters(
+        select(*repository.model.__table__.c), data
+    )
+
+    plan = await explain(query)
+
+    assert seq_scans(plan) == []
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("days", [7, 30])
+async def test_period_queries_use_indexes(seeded_coils, days):
+    start_date = SEED_END - timedelta(days=days)
+
+    statistics_plan = await explain(
+        repository._period_statistics_query(start_date, SEED_END)
+    )
+    events_plan = await explain(
+        repository._occupancy_events_query(start_date, SEED_END)
+    )
+
+    assert seq_scans(statistics_plan) == []
+    assert seq_scans(events_plan) == []
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("days_ago", [1, 365, 1000])
+async def test_as_of_query_uses_stored_period_index(seeded_coils, days_ago):
+    moment = SEED_END - timedelta(days=days_ago)
+    query = repository._apply_as_of_filter(
+        select(*repository.model.__table__.c), moment
+    )
+
+    plan = await explain(query)
+
+    assert seq_scans(plan) == []
+    assert "ix_coils_stored_period" in json.dumps(plan)
@@ -0,0 +1,151 @@
+from time import time
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+from sqlalchemy import text
+
+import src.database as database
+from src.config import settings
+from src.database import (
+    PRIMARY_READS_COOKIE,
+    Base,
+    ReadRouter,
+    get_engine,
+)
+from tests.conftest import wait_for_job
+
+REPLICA_DB = f"{settings.postgres_db}_replica"
+REPLICA_URL = settings.database_url.rsplit("/", 1)[0] + f"/{REPLICA_DB}"
+
+
+async def create_replica_database():
+    async with get_engine().connect() as connection:
+        connection = await connection.execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        exists = await connection.scalar(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": REPLICA_DB},
+        )
+        if not exists:
+            await connection.execute(text(f'CREATE DATABASE "{REPLICA_DB}"'))
+
+
+@pytest_asyncio.fixture
+async def replica(client, monkeypatch):
+    await create_replica_database()
+    router = ReadRouter([REPLICA_URL])
+    async with router.replicas[0].begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(database, "get_read_router", lambda: router)
+    yield router
+    await router.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica(client, replica, sample_coil_data):
+    response = await client.post("/api/coils/", json=sample_coil_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    client.cookies.clear()
+
+    response_list = await client.get("/api/coils/")
+    response_filtered = await client.get(
+        "/api/coils/filtered", params={"length_min": 1}
+    )
+    response_statistics = await client.get("/api/statistics/")
+
+    assert response_list.json()["items"] == []
+    assert response_filtered.json()["items"] == []
+    assert response_statistics.json()["added_coils_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_cover_replicas(client, replica):
+    response_before = await client.get("/api/metrics/pool")
+    await client.get("/api/coils/")
+    response_after = await client.get("/api/metrics/pool")
+
+    assert (
+        response_after.json()["acquisitions"]
+        == response_before.json()["acquisitions"] + 1
+    )
+    engines = response_after.json()["engines"]
+    assert list(engines) == [
+        get_engine().url.render_as_string(),
+        replica.replicas[0].url.render_as_string(),
+    ]
+    assert engines[replica.replicas[0].url.render_as_string()]["idle"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_reads_after_write_stick_to_primary(
+    client, replica, sample_coil_data
+):
+    response = await client.post("/api/coils/", json=sample_coil_data)
+
+    assert PRIMARY_READS_COOKIE in response.cookies
+    response_list = await client.get("/api/coils/")
+    assert [coil["id"] for coil in response_list.json()["items"]] == [
+        response.json()["id"]
+    ]
+
+    client.cookies.set(PRIMARY_READS_COOKIE, str(time() - 1))
+    response_expired = await client.get("/api/coils/")
+    assert response_expired.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_statistics_after_write_read_primary(
+    client, replica, sample_coil_data
+):
+    response = await client.post("/api/coils/", json=sample_coil_data)
+    primary_until = response.cookies[PRIMARY_READS_COOKIE]
+    client.cookies.clear()
+
+    response_replica = await client.get("/api/statistics/")
+    assert response_replica.json()["added_coils_count"] == 0
+
+    client.cookies.set(PRIMARY_READS_COOKIE, primary_until)
+    response_primary = await client.get("/api/statistics/")
+    assert response_primary.json()["added_coils_count"] == 1
+
+    response_metrics = await client.get("/api/metrics/statistics-cache")
+    assert response_metrics.json()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_statistics_jobs_after_write_read_primary(
+    client, replica, sample_coil_data
+):
+    response = await client.post("/api/coils/", json=sample_coil_data)
+    primary_until = response.cookies[PRIMARY_READS_COOKIE]
+    client.cookies.clear()
+
+    response_replica = await client.post("/api/statistics/jobs", json={})
+    job_replica = await wait_for_job(client, response_replica.json()["id"])
+    assert job_replica["result"]["added_coils_count"] == 0
+
+    client.cookies.set(PRIMARY_READS_COOKIE, primary_until)
+    response_primary = await client.post("/api/statistics/jobs", json={})
+    job_primary = await wait_for_job(client, response_primary.json()["id"])
+    assert job_primary["result"]["added_coils_count"] == 1
+    assert job_primary["chunks_reused"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_stick_to_primary(client, replica):
+    response = await client.delete("/api/coils/1")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert PRIMARY_READS_COOKIE not in response.cookies
+
+
+@pytest.mark.asyncio
+async def test_no_sticky_cookie_without_replicas(client, sample_coil_data):
+    response = await client.post("/api/coils/", json=sample_coil_data)
+
+    assert PRIMARY_READS_COOKIE not in response.cookies
+    response_list = await client.get("/api/coils/")
+    assert len(response_list.json()["items"]) == 1
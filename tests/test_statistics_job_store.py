@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.schemas.statistics_schema import (
+    StatisticsBackend,
+    StatisticsJobSchema,
+    StatisticsJobStatus,
+)
+from src.services.statistics_jobs import (
+    InMemoryStatisticsJobStore,
+    StatisticsJobStore,
+)
+
+NOW = datetime(2025, 3, 15, 12, 0)
+
+
+@pytest.fixture(params=[lambda: InMemoryStatisticsJobStore(10)])
+def store(request) -> StatisticsJobStore:
+    return request.param()
+
+
+def make_job(job_id: str, finished_at=None) -> StatisticsJobSchema:
+    return StatisticsJobSchema(
+        id=job_id,
+        status=StatisticsJobStatus.COMPLETED,
+        start_date=NOW - timedelta(days=30),
+        end_date=NOW,
+        backend=StatisticsBackend.SQL,
+        created_at=NOW,
+        finished_at=finished_at,
+    )
+
+
+def chunk_key(start: datetime, end: datetime):
+    return (start, end, StatisticsBackend.SQL)
+
+
+def test_store_is_abstract():
+    with pytest.raises(TypeError):
+        StatisticsJobStore()
+
+
+@pytest.mark.asyncio
+async def test_store_saves_job_snapshots(store):
+    job = make_job("first")
+    await store.save(job)
+    job.chunks_done = 5
+
+    saved = await store.get("first")
+    assert saved is not None
+    assert saved.chunks_done == 0
+    assert await store.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_store_purges_finished_jobs(store):
+    await store.save(make_job("running"))
+    await store.save(make_job("old", finished_at=NOW - timedelta(hours=2)))
+    await store.save(make_job("recent", finished_at=NOW))
+
+    await store.purge(NOW - timedelta(hours=1))
+
+    assert await store.get("running") is not None
+    assert await store.get("old") is None
+    assert await store.get("recent") is not None
+
+
+@pytest.mark.asyncio
+async def test_store_invalidates_chunks_from_moment(store):
+    january = chunk_key(datetime(2025, 1, 1), datetime(2025, 1, 31))
+    february = chunk_key(datetime(2025, 2, 1), datetime(2025, 2, 28))
+    await store.save_chunk(january, [(datetime(2025, 1, 1).date(), 1, 5.0)])
+    await store.save_chunk(february, [(datetime(2025, 2, 1).date(), 2, 9.0)])
+
+    assert await store.get_chunk(january) == [
+        (datetime(2025, 1, 1).date(), 1, 5.0)
+    ]
+    await store.invalidate_chunks(datetime(2025, 2, 10))
+
+    assert await store.get_chunk(january) is not None
+    assert await store.get_chunk(february) is None
+
+
+@pytest.mark.asyncio
+async def test_store_clear(store):
+    key = chunk_key(datetime(2025, 1, 1), datetime(2025, 1, 31))
+    await store.save(make_job("first"))
+    await store.save_chunk(key, [])
+
+    await store.clear()
+
+    assert await store.get("first") is None
+    assert await store.get_chunk(key) is None
@@ -1,8 +1,17 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from fastapi import status
 
+from src.config import settings
+from src.database import new_session
+from src.models.coil_model import CoilModel
+from src.repositories.coil_statistics_repository import (
+    CoilStatisticsRepository,
+)
+from src.services.statistics_cache import statistics_cache
+from tests.conftest import wait_for_job
+
 
 @pytest.mark.asyncio
 async def test_get_statistics(client):
@@ -19,9 +28,10 @@ async def test_get_statistics(client):
 
     response_get_coils = await client.get("/api/coils/")
     assert response_get_coils.status_code == status.HTTP_200_OK
-    assert len(response_get_coils.json()) == 2
-    assert response_get_coils.json()[0]["id"] == response1.json()["id"]
-    assert response_get_coils.json()[1]["id"] == response2.json()["id"]
+    coils = response_get_coils.json()["items"]
+    assert len(coils) == 2
+    assert coils[0]["id"] == response1.json()["id"]
+    assert coils[1]["id"] == response2.json()["id"]
 
     response = await client.get("/api/statistics/")
 
@@ -63,6 +73,96 @@ async def test_get_statistics_with_date_params(client):
     assert response.json()["removed_coils_count"] == 1
 
 
+@pytest.mark.asyncio
+async def test_get_statistics_ignores_removals_outside_period(client):
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    start_date = now - timedelta(days=10)
+    end_date = now - timedelta(days=3)
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=100.0,
+                    weight=500.0,
+                    creation_date=now - timedelta(days=30),
+                    deletion_date=(now - timedelta(days=20)).replace(
+                        tzinfo=timezone.utc
+                    ),
+                ),
+                CoilModel(
+                    length=150.0,
+                    weight=750.0,
+                    creation_date=now - timedelta(days=8),
+                    deletion_date=(now - timedelta(days=6)).replace(
+                        tzinfo=timezone.utc
+                    ),
+                ),
+                CoilModel(
+                    length=200.0,
+                    weight=1000.0,
+                    creation_date=now - timedelta(days=8),
+                    deletion_date=(now - timedelta(days=1)).replace(
+                        tzinfo=timezone.utc
+                    ),
+                ),
+            ]
+        )
+        await session.commit()
+
+    response = await client.get(
+        "/api/statistics/",
+        params={
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["added_coils_count"] == 2
+    assert response.json()["removed_coils_count"] == 1
+    assert response.json()["min_storage_time"] == pytest.approx(172800.0)
+    assert response.json()["max_storage_time"] == pytest.approx(172800.0)
+
+
+@pytest.mark.asyncio
+async def test_get_statistics_counts_removals_on_period_bounds(client):
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    start_date = now - timedelta(days=10)
+    end_date = now - timedelta(days=5)
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=100.0,
+                    weight=500.0,
+                    creation_date=start_date - timedelta(days=2),
+                    deletion_date=start_date.replace(tzinfo=timezone.utc),
+                ),
+                CoilModel(
+                    length=150.0,
+                    weight=750.0,
+                    creation_date=start_date + timedelta(days=1),
+                    deletion_date=end_date.replace(tzinfo=timezone.utc),
+                ),
+            ]
+        )
+        await session.commit()
+
+    response = await client.get(
+        "/api/statistics/",
+        params={
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["added_coils_count"] == 2
+    assert response.json()["removed_coils_count"] == 2
+    assert response.json()["min_storage_time"] == pytest.approx(172800.0)
+    assert response.json()["max_storage_time"] == pytest.approx(345600.0)
+
+
 @pytest.mark.asyncio
 async def test_get_statistics_empty_data(client):
     response = await client.get("/api/statistics/")
@@ -118,3 +218,356 @@ async def test_get_statistics_with_single_date(client):
     response_end = await client.get(f"/api/statistics/?end_date={end_date}")
     assert response_end.status_code == status.HTTP_200_OK
     assert response_end.json()["added_coils_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_statistics_sweep_backend_matches_sql(client):
+    coil_data_1 = {"length": 100.0, "weight": 500.0}
+    coil_data_2 = {"length": 150.0, "weight": 750.0}
+
+    response1 = await client.post("/api/coils/", json=coil_data_1)
+    await client.post("/api/coils/", json=coil_data_2)
+    await client.delete(f"/api/coils/{response1.json()['id']}")
+
+    response_sql = await client.get("/api/statistics/?backend=sql")
+    response_sweep = await client.get("/api/statistics/?backend=sweep")
+
+    assert response_sql.status_code == status.HTTP_200_OK
+    assert response_sweep.status_code == status.HTTP_200_OK
+    assert response_sweep.json() == response_sql.json()
+    assert response_sweep.json()["max_coils_count"] == 2
+    assert response_sweep.json()["max_weight_total"] == 1250.0
+
+
+@pytest.mark.asyncio
+async def test_get_statistics_rollup_backend_matches_sql(client):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=100.0,
+                    weight=500.0,
+                    creation_date=now - timedelta(days=20),
+                    deletion_date=(now - timedelta(days=5)).replace(
+                        tzinfo=timezone.utc
+                    ),
+                ),
+                CoilModel(
+                    length=150.0,
+                    weight=750.0,
+                    creation_date=now - timedelta(days=10),
+                ),
+            ]
+        )
+        await session.commit()
+        await CoilStatisticsRepository().rebuild(session)
+
+    await client.post("/api/coils/", json={"length": 50.0, "weight": 250.0})
+
+    response_sql = await client.get("/api/statistics/?backend=sql")
+    response_rollup = await client.get("/api/statistics/?backend=rollup")
+
+    assert response_sql.status_code == status.HTTP_200_OK
+    assert response_rollup.status_code == status.HTTP_200_OK
+    assert response_rollup.json() == response_sql.json()
+    assert response_rollup.json()["max_coils_count"] == 2
+    assert response_rollup.json()["max_weight_total"] == 1250.0
+
+
+@pytest.mark.asyncio
+async def test_get_occupancy_series_matches_daily_statistics(client):
+    today = datetime.now(timezone.utc).replace(
+        tzinfo=None, hour=0, minute=0, second=0, microsecond=0
+    )
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=100.0,
+                    weight=500.0,
+                    creation_date=today - timedelta(days=40, hours=-3),
+                    deletion_date=(
+                        today - timedelta(days=5, hours=-2)
+                    ).replace(tzinfo=timezone.utc),
+                ),
+                CoilModel(
+                    length=150.0,
+                    weight=750.0,
+                    creation_date=today - timedelta(days=10, hours=-6),
+                ),
+                CoilModel(
+                    length=50.0,
+                    weight=250.0,
+                    creation_date=today - timedelta(days=8, hours=-1),
+                    deletion_date=(
+                        today - timedelta(days=8, hours=-4)
+                    ).replace(tzinfo=timezone.utc),
+                ),
+            ]
+        )
+        await session.commit()
+
+    params = {
+        "start_date": (today - timedelta(days=14)).isoformat(),
+        "end_date": today.isoformat(),
+    }
+    response = await client.get("/api/statistics/timeseries", params=params)
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["granularity"] == "day"
+    assert len(body["items"]) == 15
+    series = {
+        datetime.fromisoformat(item["bucket"]).date(): (
+            item["active_count"],
+            item["total_weight"],
+        )
+        for item in body["items"]
+    }
+    assert series[(today - timedelta(days=14)).date()] == (1, 500.0)
+    assert series[(today - timedelta(days=10)).date()] == (2, 1250.0)
+    assert series[(today - timedelta(days=8)).date()] == (3, 1500.0)
+    assert series[(today - timedelta(days=7)).date()] == (2, 1250.0)
+    assert series[(today - timedelta(days=5)).date()] == (2, 1250.0)
+    assert series[(today - timedelta(days=4)).date()] == (1, 750.0)
+
+    response_statistics = await client.get("/api/statistics/", params=params)
+    statistics = response_statistics.json()
+    counts = [count for count, _ in series.values()]
+    weights = [weight for _, weight in series.values()]
+    assert statistics["max_coils_count"] == max(counts)
+    assert statistics["min_coils_count"] == min(counts)
+    assert statistics["max_weight_total"] == max(weights)
+    assert statistics["min_weight_total"] == min(weights)
+
+
+@pytest.mark.asyncio
+async def test_get_occupancy_series_by_month(client):
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=100.0,
+                    weight=500.0,
+                    creation_date=datetime(2024, 1, 15),
+                    deletion_date=datetime(2024, 3, 10, tzinfo=timezone.utc),
+                ),
+                CoilModel(
+                    length=150.0,
+                    weight=750.0,
+                    creation_date=datetime(2024, 2, 20),
+                ),
+            ]
+        )
+        await session.commit()
+
+    response = await client.get(
+        "/api/statistics/timeseries",
+        params={
+            "start_date": "2023-12-10T00:00:00",
+            "end_date": "2024-04-05T00:00:00",
+            "granularity": "month",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        (item["bucket"][:7], item["active_count"], item["total_weight"])
+        for item in response.json()["items"]
+    ] == [
+        ("2023-12", 0, 0.0),
+        ("2024-01", 1, 500.0),
+        ("2024-02", 2, 1250.0),
+        ("2024-03", 2, 1250.0),
+        ("2024-04", 1, 750.0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_occupancy_series_start_date_after_end_date(client):
+    response = await client.get(
+        "/api/statistics/timeseries",
+        params={
+            "start_date": "2023-06-01T00:00:00",
+            "end_date": "2023-05-01T00:00:00",
+        },
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Invalid date range" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_get_distribution(client):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=length,
+                    weight=length * 10,
+                    creation_date=now - timedelta(days=5),
+                    deletion_date=(
+                        (now - timedelta(days=5 - length // 10)).replace(
+                            tzinfo=timezone.utc
+                        )
+                        if length <= 20
+                        else None
+                    ),
+                )
+                for length in (10.0, 20.0, 30.0, 40.0, 50.0)
+            ]
+        )
+        await session.commit()
+
+    response = await client.get(
+        "/api/statistics/distribution", params={"buckets": 4}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["coils_count"] == 5
+    assert body["removed_coils_count"] == 2
+    assert body["approximate"] is False
+    length = body["length"]
+    assert (length["min"], length["max"]) == (10.0, 50.0)
+    assert length["p50"] == pytest.approx(30.0)
+    assert length["p90"] == pytest.approx(46.0)
+    assert length["p99"] == pytest.approx(49.6)
+    assert [bucket["count"] for bucket in length["histogram"]] == [1, 1, 1, 2]
+    assert [bucket["lower"] for bucket in length["histogram"]] == [
+        10.0,
+        20.0,
+        30.0,
+        40.0,
+    ]
+    assert body["weight"]["p50"] == pytest.approx(300.0)
+    storage_time = body["storage_time"]
+    assert storage_time["min"] == pytest.approx(86400.0)
+    assert storage_time["max"] == pytest.approx(172800.0)
+    assert sum(bucket["count"] for bucket in storage_time["histogram"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_distribution_empty_period(client):
+    response = await client.get("/api/statistics/distribution")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["coils_count"] == 0
+    assert response.json()["length"]["p50"] is None
+    assert response.json()["length"]["histogram"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_distribution_approximate(client, monkeypatch):
+    monkeypatch.setattr(settings, "statistics_sample_percent", 100.0)
+    for length in (10.0, 20.0, 30.0):
+        await client.post(
+            "/api/coils/", json={"length": length, "weight": 100.0}
+        )
+
+    response_exact = await client.get("/api/statistics/distribution")
+    response_approximate = await client.get(
+        "/api/statistics/distribution", params={"approximate": True}
+    )
+
+    assert response_approximate.status_code == status.HTTP_200_OK
+    approximate = response_approximate.json()
+    assert approximate["approximate"] is True
+    assert approximate["sample_percent"] == 100.0
+    assert approximate["length"] == response_exact.json()["length"]
+    assert approximate["coils_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_statistics_job_matches_statistics(client):
+    today = datetime.now(timezone.utc).replace(
+        tzinfo=None, hour=0, minute=0, second=0, microsecond=0
+    )
+    async with new_session() as session:
+        session.add_all(
+            [
+                CoilModel(
+                    length=100.0,
+                    weight=500.0,
+                    creation_date=today - timedelta(days=150),
+                    deletion_date=(today - timedelta(days=40)).replace(
+                        tzinfo=timezone.utc
+                    ),
+                ),
+                CoilModel(
+                    length=150.0,
+                    weight=750.0,
+                    creation_date=today - timedelta(days=70),
+                ),
+            ]
+        )
+        await session.commit()
+
+    params = {
+        "start_date": (today - timedelta(days=200)).isoformat(),
+        "end_date": today.isoformat(),
+    }
+    response_statistics = await client.get("/api/statistics/", params=params)
+    statistics_cache.clear()
+
+    response = await client.post("/api/statistics/jobs", json=params)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["status"] == "pending"
+    job = await wait_for_job(client, response.json()["id"])
+    assert job["status"] == "completed"
+    assert job["chunks_total"] >= 7
+    assert job["chunks_done"] == job["chunks_total"]
+    assert job["result"] == response_statistics.json()
+
+
+@pytest.mark.asyncio
+async def test_statistics_job_reuses_month_chunks(client):
+    await client.post("/api/coils/", json={"length": 100.0, "weight": 500.0})
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_date = (today - timedelta(days=100)).isoformat()
+    end_date = (today + timedelta(days=1)).isoformat()
+
+    first = await client.post(
+        "/api/statistics/jobs",
+        json={"start_date": start_date, "end_date": end_date},
+    )
+    first_job = await wait_for_job(client, first.json()["id"])
+    second = await client.post(
+        "/api/statistics/jobs",
+        json={
+            "start_date": start_date,
+            "end_date": (today + timedelta(days=2)).isoformat(),
+        },
+    )
+    second_job = await wait_for_job(client, second.json()["id"])
+
+    assert first_job["chunks_reused"] == 0
+    assert second_job["chunks_reused"] == second_job["chunks_total"] - 1
+    assert second_job["result"]["added_coils_count"] == 1
+
+    await client.post("/api/coils/", json={"length": 100.0, "weight": 500.0})
+    third = await client.post(
+        "/api/statistics/jobs",
+        json={"start_date": start_date, "end_date": end_date},
+    )
+    third_job = await wait_for_job(client, third.json()["id"])
+    assert third_job["chunks_reused"] == third_job["chunks_total"] - 1
+    assert third_job["result"]["added_coils_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_statistics_job_errors(client):
+    response_missing = await client.get("/api/statistics/jobs/unknown")
+    response_invalid = await client.post(
+        "/api/statistics/jobs",
+        json={
+            "start_date": "2023-06-01T00:00:00",
+            "end_date": "2023-05-01T00:00:00",
+        },
+    )
+
+    assert response_missing.status_code == status.HTTP_404_NOT_FOUND
+    assert response_invalid.status_code == status.HTTP_400_BAD_REQUEST